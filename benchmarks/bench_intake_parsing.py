@@ -0,0 +1,283 @@
+"""
+Microbenchmarks for intake payload parsing and field normalization.
+
+Times ``PayloadParser`` (detection and the per-format parsers), the compiled
+``parse_incoming_payload`` path and the field normalizers over a corpus of
+representative and worst-case payloads. Each case reports ops/sec (best of
+several repeats) and the peak memory allocated by one call, measured with
+``tracemalloc``.
+
+``--save-baseline`` records the results. ``--check`` compares a run against
+that baseline and exits non-zero when a case is slower or allocates more than
+the allowed margins. Ops/sec depends on the machine, so record the baseline
+on the machine that runs the check. Allocations are stable across machines.
+
+Usage (from the repository root):
+    python benchmarks/bench_intake_parsing.py [--filter normalize]
+        [--save-baseline benchmarks/parsing-baseline.json]
+        [--check benchmarks/parsing-baseline.json] [--max-slowdown 0.2]
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger  # noqa: E402
+
+from clio_manage.payload_parser import (  # noqa: E402
+    PayloadParser,
+    parse_incoming_payload,
+)
+from clio_manage.utils.normalize_fields_recursive import (  # noqa: E402
+    normalize_fields_recursive,
+)
+from clio_manage.utils.recursive_field_normalizer import (  # noqa: E402
+    recursive_normalize,
+)
+
+Case = Tuple[str, Callable[[Any], Any], Any]
+
+
+def _b64(value: Any) -> str:
+    text = value if isinstance(value, str) else json.dumps(value)
+    return base64.b64encode(text.encode("utf-8")).decode("ascii")
+
+
+TRANSCRIPT = " ".join(
+    f"Agent: Can you describe what happened on day {i}? "
+    f"Caller: I slipped on a wet floor at the store and hurt my back ({i})."
+    for i in range(400)
+)
+
+DIRECT = {
+    "inbox_lead": {
+        "from_first": "John",
+        "from_last": "Smith",
+        "from_message": "Full Voice agent transcript here.",
+        "from_email": "john@example.com",
+        "from_phone": "0987654321",
+        "referring_url": "https://vonage.com/voice-agent",
+        "from_source": "Capture Now Agent",
+    },
+    "inbox_lead_token": "TOKEN",
+}
+
+MIXED = {
+    "first_name": "Minnie",
+    "last_name": "Mouse",
+    "email": "minnie@example.com",
+    "phone_number": "5551234567",
+    "message": False,
+    "source": "Website",
+}
+
+ENVELOPE = {
+    "inbox_leads": [
+        {
+            "id": 27173864 + i,
+            "errors": {},
+            "created_at": "July 28, 2025 at 3:36 pm (EDT)",
+            "first_name": f"Lead{i}",
+            "last_name": "Mouse",
+            "email": f"lead{i}@example.com",
+            "phone_number": None,
+            "message": False,
+            "call_duration": 0,
+            "call_recording_url": None,
+            "source": None,
+        }
+        for i in range(25)
+    ],
+    "call_duration": 0,
+    "created_at": "July 28, 2025 at 3:36 pm (EDT)",
+}
+
+LONG_TRANSCRIPT = {**MIXED, "message": TRANSCRIPT}
+
+
+def _nested(depth: int) -> Dict[str, Any]:
+    node: Dict[str, Any] = {"value": "leaf", "count": 1}
+    for i in range(depth):
+        node = {"level": i, "children": [node, {"note": f"sibling {i}"}]}
+    return node
+
+
+DEEP_NESTING = {**MIXED, "metadata": _nested(60)}
+
+# Custom fields wrapped the way some form builders send them: base64 JSON,
+# and base64 of a JSON string that itself holds JSON
+BASE64_JSON = {
+    **MIXED,
+    "custom_fields": _b64({"case_type": "personal_injury", "urgency": "high"}),
+    "answers": _b64(
+        json.dumps(_b64([{"q": f"Q{i}", "a": f"A{i}"} for i in range(20)]))
+    ),
+    "transcript": _b64(json.dumps({"text": TRANSCRIPT[:4000]})),
+}
+
+# Envelope whose leads repeat the same encoded metadata, as Capture Now sends
+# for one call; exercises the decode cache
+SHARED_BLOB_ENVELOPE = {
+    **ENVELOPE,
+    "inbox_leads": [
+        {
+            **lead,
+            "metadata": _b64(
+                {"campaign": "spring", "agent": "voice-1", "tags": [1, 2]}
+            ),
+            "custom_fields": json.dumps({"case_type": "personal_injury"}),
+        }
+        for lead in ENVELOPE["inbox_leads"]
+    ],
+}
+
+CORPUS: Dict[str, Any] = {
+    "direct": DIRECT,
+    "mixed": MIXED,
+    "envelope_x25": ENVELOPE,
+    "long_transcript": LONG_TRANSCRIPT,
+    "deep_nesting": DEEP_NESTING,
+    "base64_json": BASE64_JSON,
+    "shared_blob_x25": SHARED_BLOB_ENVELOPE,
+}
+
+
+def build_cases() -> List[Case]:
+    cases: List[Case] = []
+    for name in ("direct", "mixed", "envelope_x25"):
+        cases.append(
+            (f"detect/{name}", PayloadParser.detect_payload_type, CORPUS[name])
+        )
+    cases += [
+        ("parse_direct/direct", PayloadParser.parse_direct_payload, DIRECT),
+        ("parse_envelope/envelope_x25", PayloadParser.parse_envelope_payload, ENVELOPE),
+        ("parse_mixed/mixed", PayloadParser.parse_mixed_payload, MIXED),
+        (
+            "parse_mixed/long_transcript",
+            PayloadParser.parse_mixed_payload,
+            LONG_TRANSCRIPT,
+        ),
+    ]
+    for name in ("direct", "envelope_x25", "long_transcript"):
+        cases.append((f"parse_incoming/{name}", parse_incoming_payload, CORPUS[name]))
+    for name, payload in CORPUS.items():
+        cases.append((f"recursive_normalize/{name}", recursive_normalize, payload))
+        cases.append(
+            (f"normalize_fields_recursive/{name}", normalize_fields_recursive, payload)
+        )
+    return cases
+
+
+def measure_ops(func: Callable[[Any], Any], payload: Any, repeat: int) -> float:
+    """Best-of-``repeat`` calls per second, each repeat running >= 0.2s."""
+    timer = timeit.Timer(lambda: func(payload))
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return number / best
+
+
+def measure_alloc(func: Callable[[Any], Any], payload: Any) -> int:
+    """Peak bytes allocated while running one call."""
+    func(payload)  # warm caches so one-off imports/compiles are not counted
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func(payload)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - base
+
+
+def run(cases: List[Case], repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    print(f"{'case':<44}{'ops/sec':>12}{'alloc KiB':>12}")
+    for name, func, payload in cases:
+        alloc = measure_alloc(func, payload)
+        ops = measure_ops(func, payload, repeat)
+        results[name] = {"ops_per_sec": ops, "alloc_bytes": alloc}
+        print(f"{name:<44}{ops:>12,.0f}{alloc / 1024:>12.1f}")
+    return results
+
+
+def check(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    max_slowdown: float,
+    max_alloc_growth: float,
+) -> List[str]:
+    """Describe every case that regressed past the allowed margins."""
+    failures = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        min_ops = base["ops_per_sec"] * (1 - max_slowdown)
+        if result["ops_per_sec"] < min_ops:
+            failures.append(
+                f"{name}: {result['ops_per_sec']:,.0f} ops/sec < "
+                f"{min_ops:,.0f} (baseline {base['ops_per_sec']:,.0f})"
+            )
+        # Small absolute slack so tiny allocations do not flap
+        max_alloc = base["alloc_bytes"] * (1 + max_alloc_growth) + 256
+        if result["alloc_bytes"] > max_alloc:
+            failures.append(
+                f"{name}: {result['alloc_bytes']:,} bytes allocated > "
+                f"{max_alloc:,.0f} (baseline {base['alloc_bytes']:,})"
+            )
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filter", default="", help="Only run cases containing this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--check", metavar="PATH", help="Baseline to compare against")
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=0.2,
+        help="Allowed ops/sec drop as a fraction of the baseline",
+    )
+    parser.add_argument(
+        "--max-alloc-growth",
+        type=float,
+        default=0.1,
+        help="Allowed allocation growth as a fraction of the baseline",
+    )
+    args = parser.parse_args()
+
+    # Logging cost would dominate the timings and is not what is measured here
+    logger.remove()
+
+    cases = [case for case in build_cases() if args.filter in case[0]]
+    results = run(cases, args.repeat)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.check:
+        with open(args.check) as f:
+            baseline = json.load(f)
+        failures = check(results, baseline, args.max_slowdown, args.max_alloc_growth)
+        if failures:
+            print("\nRegressions:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Before/after benchmark for intake payload mapping.
+
+Compares the multi-model ``PayloadParser`` path (format model ->
+``BotDataInput`` -> ``ClioInboxLead``) with the compiled single-pass
+``lead_mapper`` + ``to_clio_payload`` path, for each payload format.
+
+Usage (from the repository root):
+    python benchmarks/bench_lead_mapping.py [--number 2000] [--leads 25]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger  # noqa: E402
+
+from clio_manage.lead_mapping import lead_mapper, to_clio_payload  # noqa: E402
+from clio_manage.payload_parser import (  # noqa: E402
+    PayloadParser,
+    normalize_to_clio_format,
+)
+
+DIRECT_PAYLOAD = {
+    "inbox_lead": {
+        "from_first": "John",
+        "from_last": "Smith",
+        "from_message": "Full Voice agent transcript here.",
+        "from_email": "john@example.com",
+        "from_phone": "0987654321",
+        "referring_url": "https://vonage.com/voice-agent",
+        "from_source": "Capture Now Agent",
+    },
+    "inbox_lead_token": "TOKEN",
+}
+
+MIXED_PAYLOAD = {
+    "first_name": "Minnie",
+    "last_name": "Mouse",
+    "email": "minnie@example.com",
+    "phone_number": "5551234567",
+    "message": False,
+    "source": "Website",
+}
+
+
+def envelope_payload(leads: int) -> dict:
+    return {
+        "inbox_leads": [
+            {
+                "id": 27173864 + i,
+                "errors": {},
+                "created_at": "July 28, 2025 at 3:36 pm (EDT)",
+                "first_name": f"Lead{i}",
+                "last_name": "Mouse",
+                "email": f"lead{i}@example.com",
+                "phone_number": None,
+                "message": False,
+                "call_duration": 0,
+                "call_recording_url": None,
+                "source": None,
+            }
+            for i in range(leads)
+        ],
+        "call_duration": 0,
+        "created_at": "July 28, 2025 at 3:36 pm (EDT)",
+    }
+
+
+def _as_list(parsed):
+    return parsed if isinstance(parsed, list) else [parsed]
+
+
+def before(parse, payload):
+    return [normalize_to_clio_format(lead).model_dump() for lead in parse(payload)]
+
+
+def after(parse, payload):
+    return [to_clio_payload(lead) for lead in parse(payload)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--leads", type=int, default=25)
+    args = parser.parse_args()
+
+    # Logging cost is the same for both paths and would dominate the timings
+    logger.remove()
+
+    cases = [
+        (
+            "direct",
+            DIRECT_PAYLOAD,
+            lambda p: [PayloadParser.parse_direct_payload(p)],
+            lambda p: [lead_mapper.map_direct(p)],
+        ),
+        (
+            f"envelope x{args.leads}",
+            envelope_payload(args.leads),
+            PayloadParser.parse_envelope_payload,
+            lead_mapper.map_envelope,
+        ),
+        (
+            "mixed",
+            MIXED_PAYLOAD,
+            lambda p: [PayloadParser.parse_mixed_payload(p)],
+            lambda p: [lead_mapper.map_mixed(p)],
+        ),
+    ]
+
+    print(f"{'format':<16}{'before µs':>12}{'after µs':>12}{'speedup':>10}")
+    for name, payload, old_parse, new_parse in cases:
+        assert before(old_parse, payload) == after(new_parse, payload), name
+        old = timeit.timeit(lambda: before(old_parse, payload), number=args.number)
+        new = timeit.timeit(lambda: after(new_parse, payload), number=args.number)
+        per_call = 1e6 / args.number
+        print(
+            f"{name:<16}{old * per_call:>12.1f}{new * per_call:>12.1f}{old / new:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Local stand-in for the Clio Grow inbox lead endpoint.
+
+Accepts ``POST /inbox_leads`` and answers like Clio Grow (201 with an
+``inbox_lead`` id) after a configurable delay, with optional injected 5xx
+errors and 429 rate-limit responses. Point a proxy at it with
+``CLIO_GROW_INBOX_URL=http://127.0.0.1:9100/inbox_leads`` and drive the proxy
+with ``load_intake.py``.
+
+Any ``inbox_lead_token`` is accepted, including the empty one the proxies
+send when ``LEAD_INBOX_TOKEN`` is unset. With ``--inbox-token`` a mismatch is
+answered with 401; start the proxies with the same ``LEAD_INBOX_TOKEN`` then.
+
+Usage (from the repository root):
+    python benchmarks/clio_grow_stub.py [--port 9100] [--latency-ms 80]
+        [--jitter-ms 40] [--error-rate 0.01] [--rate-limit-rate 0.02]
+        [--inbox-token TOKEN]
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+from collections import Counter
+from typing import Any, Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def create_app(
+    latency_ms: float = 80.0,
+    jitter_ms: float = 40.0,
+    error_rate: float = 0.0,
+    rate_limit_rate: float = 0.0,
+    retry_after: int = 1,
+    inbox_token: Optional[str] = None,
+) -> FastAPI:
+    """
+    Build the stub app with the given response behaviour.
+
+    With ``inbox_token`` set, requests carrying another token get a 401.
+    """
+    app = FastAPI(title="Clio Grow stub")
+    lead_ids = itertools.count(27_000_000)
+    outcomes: Counter = Counter()
+
+    @app.post("/inbox_leads")
+    async def create_inbox_lead(request: Request):
+        body = await request.json()
+        delay = max(latency_ms + random.uniform(-jitter_ms, jitter_ms), 0.0)
+        await asyncio.sleep(delay / 1000)
+
+        roll = random.random()
+        if roll < rate_limit_rate:
+            outcomes["429"] += 1
+            return JSONResponse(
+                {"error": "Rate limit exceeded"},
+                status_code=429,
+                headers={"Retry-After": str(retry_after)},
+            )
+        if roll < rate_limit_rate + error_rate:
+            outcomes["503"] += 1
+            return JSONResponse({"error": "Service unavailable"}, status_code=503)
+
+        if inbox_token is not None and body.get("inbox_lead_token") != inbox_token:
+            outcomes["401"] += 1
+            return JSONResponse({"error": "Invalid inbox lead token"}, status_code=401)
+
+        inbox_lead: Dict[str, Any] = body.get("inbox_lead") or {}
+        if not inbox_lead.get("from_first"):
+            outcomes["422"] += 1
+            return JSONResponse(
+                {"errors": {"inbox_lead": ["is invalid"]}}, status_code=422
+            )
+
+        outcomes["201"] += 1
+        return JSONResponse(
+            {"inbox_lead": {"id": next(lead_ids), **inbox_lead}}, status_code=201
+        )
+
+    @app.get("/stats")
+    async def stats():
+        """Responses sent so far, by status code."""
+        return dict(outcomes)
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        outcomes.clear()
+        return {"status": "reset"}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--jitter-ms", type=float, default=40.0)
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction answered with 503"
+    )
+    parser.add_argument(
+        "--rate-limit-rate",
+        type=float,
+        default=0.0,
+        help="Fraction answered with 429 and Retry-After",
+    )
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument(
+        "--inbox-token",
+        help="Only accept this inbox_lead_token (default: accept any, even empty)",
+    )
+    args = parser.parse_args()
+
+    app = create_app(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        inbox_token=args.inbox_token,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Open-loop load generator for the intake webhooks.
+
+Sends direct, envelope and mixed payloads to the intake endpoints at a fixed
+total request rate and reports throughput and p50/p95/p99 latency per
+endpoint. Requests are scheduled on a fixed timetable whether or not earlier
+ones have finished. Latency is measured from each request's scheduled start,
+so a stalled server shows up in the percentiles instead of only slowing the
+generator down.
+
+``/webhook/clio-intake`` is served by ``clio_manage.fastapi_proxy``; the other
+endpoints are served by the root ``fastapi_proxy``. Use ``--intake-base-url``
+when the two run on different ports. Every lead carries a unique name and
+email so the idempotency guard does not short-circuit repeated payloads.
+
+Usage (from the repository root, with both proxies pointed at
+``clio_grow_stub.py`` via ``CLIO_GROW_INBOX_URL``; ``LEAD_INBOX_TOKEN`` may
+stay unset unless the stub was started with ``--inbox-token``):
+    python benchmarks/load_intake.py [--base-url http://127.0.0.1:8000]
+        [--intake-base-url http://127.0.0.1:8001] [--rps 50] [--duration 30]
+        [--endpoint /webhook/unified ...] [--json results.json]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+Payload = Dict[str, Any]
+
+_sequence = itertools.count(1)
+
+
+def direct_payload() -> Payload:
+    n = next(_sequence)
+    return {
+        "inbox_lead": {
+            "from_first": f"Load{n}",
+            "from_last": "Tester",
+            "from_message": "I was injured in a car accident and need advice.",
+            "from_email": f"load{n}@example.com",
+            "from_phone": f"555{n % 10_000_000:07d}",
+            "referring_url": "https://example.com/contact",
+            "from_source": "Load Test Web Form",
+        },
+        "inbox_lead_token": "LOAD_TEST_TOKEN",
+    }
+
+
+def envelope_payload(leads: int = 3) -> Payload:
+    return {
+        "inbox_leads": [
+            {
+                "id": n,
+                "errors": {},
+                "created_at": "July 28, 2025 at 3:36 pm (EDT)",
+                "first_name": f"Voice{n}",
+                "last_name": "Caller",
+                "email": f"voice{n}@example.com",
+                "phone_number": None,
+                "message": False,
+                "call_duration": 0,
+                "call_recording_url": None,
+                "source": None,
+            }
+            for n in (next(_sequence) for _ in range(leads))
+        ],
+        "call_duration": 0,
+        "created_at": "July 28, 2025 at 3:36 pm (EDT)",
+    }
+
+
+def mixed_payload() -> Payload:
+    n = next(_sequence)
+    return {
+        "first_name": f"Mixed{n}",
+        "last_name": "Caller",
+        "email": f"mixed{n}@example.com",
+        "phone_number": f"555{n % 10_000_000:07d}",
+        "message": "Caller asked about a slip and fall claim.",
+        "source": "Load Test Agent",
+    }
+
+
+# Endpoint -> payload builders it accepts, used in rotation
+ENDPOINTS: Dict[str, Sequence[Callable[[], Payload]]] = {
+    "/webhook/clio-intake": (direct_payload, envelope_payload, mixed_payload),
+    "/webhook/unified": (direct_payload, envelope_payload, mixed_payload),
+    "/webhook/web-form": (direct_payload,),
+    "/webhook/capture-now": (mixed_payload,),
+}
+INTAKE_ENDPOINT = "/webhook/clio-intake"
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class LoadResults:
+    """Per-endpoint latencies and status counts."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, endpoint: str, status: str, latency: float) -> None:
+        self.latencies[endpoint].append(latency)
+        self.statuses[endpoint][status] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+        report = {}
+        for endpoint, latencies in self.latencies.items():
+            ordered = sorted(latencies)
+            statuses = self.statuses[endpoint]
+            ok = sum(n for status, n in statuses.items() if status.startswith("2"))
+            report[endpoint] = {
+                "requests": len(ordered),
+                "ok": ok,
+                "throughput_rps": ok / elapsed if elapsed else 0.0,
+                "p50_ms": percentile(ordered, 50) * 1000,
+                "p95_ms": percentile(ordered, 95) * 1000,
+                "p99_ms": percentile(ordered, 99) * 1000,
+                "max_ms": ordered[-1] * 1000,
+                "statuses": dict(statuses),
+            }
+        return report
+
+
+async def run_load(
+    urls: Dict[str, str],
+    rps: float,
+    duration: float,
+    max_in_flight: int,
+    timeout: float,
+    headers: Optional[Dict[str, str]] = None,
+) -> Tuple[LoadResults, float]:
+    """
+    Send ``rps`` requests per second for ``duration`` seconds, round-robin
+    across ``urls`` (endpoint -> full URL).
+    """
+    results = LoadResults()
+    in_flight = asyncio.Semaphore(max_in_flight)
+    builders = {endpoint: itertools.cycle(ENDPOINTS[endpoint]) for endpoint in urls}
+    schedule = itertools.cycle(list(urls))
+    interval = 1.0 / rps
+    total = int(rps * duration)
+
+    async with httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=max_in_flight, max_keepalive_connections=max_in_flight
+        ),
+        headers=headers,
+    ) as client:
+
+        async def fire(endpoint: str, payload: Payload, scheduled: float) -> None:
+            async with in_flight:
+                try:
+                    response = await client.post(urls[endpoint], json=payload)
+                    status = str(response.status_code)
+                except httpx.TimeoutException:
+                    status = "timeout"
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+            results.record(endpoint, status, time.perf_counter() - scheduled)
+
+        start = time.perf_counter()
+        tasks = []
+        for i in range(total):
+            scheduled = start + i * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            endpoint = next(schedule)
+            payload = next(builders[endpoint])()
+            tasks.append(asyncio.create_task(fire(endpoint, payload, scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    return results, elapsed
+
+
+def print_report(report: Dict[str, Dict[str, Any]], elapsed: float) -> None:
+    print(f"elapsed {elapsed:.1f}s")
+    print(
+        f"{'endpoint':<24}{'reqs':>7}{'ok/s':>9}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'p99 ms':>10}{'max ms':>10}  statuses"
+    )
+    for endpoint, row in report.items():
+        statuses = " ".join(f"{k}:{v}" for k, v in sorted(row["statuses"].items()))
+        print(
+            f"{endpoint:<24}{row['requests']:>7}{row['throughput_rps']:>9.1f}"
+            f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+            f"{row['max_ms']:>10.1f}  {statuses}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--intake-base-url",
+        help=f"Base URL for {INTAKE_ENDPOINT} (defaults to --base-url)",
+    )
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        choices=list(ENDPOINTS),
+        help="Endpoint to drive; repeat for several (default: all)",
+    )
+    parser.add_argument("--rps", type=float, default=50.0, help="Total request rate")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds")
+    parser.add_argument("--max-in-flight", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--async",
+        dest="respond_async",
+        action="store_true",
+        help="Send Prefer: respond-async so leads are queued (202)",
+    )
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    urls = {}
+    for endpoint in args.endpoint or list(ENDPOINTS):
+        base = args.base_url
+        if endpoint == INTAKE_ENDPOINT and args.intake_base_url:
+            base = args.intake_base_url
+        urls[endpoint] = base.rstrip("/") + endpoint
+
+    headers = {"Prefer": "respond-async"} if args.respond_async else None
+    results, elapsed = asyncio.run(
+        run_load(
+            urls, args.rps, args.duration, args.max_in_flight, args.timeout, headers
+        )
+    )
+    report = results.summary(elapsed)
+    print_report(report, elapsed)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"elapsed_s": elapsed, "endpoints": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,25 @@
 """Clio Base Model for shared fields across schemas. It supports normalization and recursive field population."""
 
-from typing import Any, Dict, Optional
+from typing import Any, ClassVar, Dict, FrozenSet, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
 
-from clio_manage.utils.recursive_field_normalizer import recursive_normalize
+from clio_manage.utils.field_normalizer import normalize_encoded
 
 
 class ClioBaseModel(BaseModel):
+    # Fields whose values may arrive base64/JSON-encoded and are decoded
+    # before validation; None means every field. Subclasses narrow this so
+    # plain fields skip the normalizer entirely.
+    decode_fields: ClassVar[Optional[FrozenSet[str]]] = None
+
     @field_validator("*", mode="before")
     @classmethod
-    def normalize_any(cls, v):
+    def normalize_any(cls, v, info: ValidationInfo):
+        if cls.decode_fields is not None and info.field_name not in cls.decode_fields:
+            return v
         # This will normalize each field, including nested dicts/lists
-        return recursive_normalize(v)
+        return normalize_encoded(v)
 
     id: Optional[int] = None
     created_at: Optional[str] = Field(
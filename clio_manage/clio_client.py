@@ -1,10 +1,12 @@
 from typing import Optional
 
-import httpx
 from auth import get_token_from_db
 from config import CLIO_API_BASE, CLIO_API_VERSION
 from sqlalchemy.orm import Session
 
+from clio_manage.services.http_transport import clio_transport
+from clio_manage.services.retry_policy import clio_retry_policy
+
 
 async def clio_get(endpoint: str, db: Session, params: Optional[dict] = None):
     token = get_token_from_db(db)
@@ -14,9 +16,11 @@ async def clio_get(endpoint: str, db: Session, params: Optional[dict] = None):
         "Authorization": f"Bearer {token.access_token}",
         "X-API-VERSION": CLIO_API_VERSION,
     }
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
+    response = await clio_retry_policy.run(
+        "GET",
+        lambda: clio_transport.client.get(
             f"{CLIO_API_BASE}{endpoint}", headers=headers, params=params
-        )
-        response.raise_for_status()
-        return response.json()
+        ),
+    )
+    response.raise_for_status()
+    return response.json()
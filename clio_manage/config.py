@@ -11,3 +11,101 @@ CLIO_API_BASE = "https://app.clio.com/api/v4"
 CLIO_API_VERSION = "4.0.12"
 
 DATABASE_URL = "sqlite:///./clio_agent.db"
+
+# Clio Grow inbox lead submission
+CLIO_GROW_INBOX_URL = os.getenv(
+    "CLIO_GROW_INBOX_URL", "https://grow.clio.com/inbox_leads"
+)
+LEAD_INBOX_TOKEN = os.getenv("LEAD_INBOX_TOKEN", "")
+CLIO_GROW_TIMEOUT_SECONDS = float(os.getenv("CLIO_GROW_TIMEOUT_SECONDS", "10"))
+CLIO_GROW_CONNECT_TIMEOUT_SECONDS = float(
+    os.getenv("CLIO_GROW_CONNECT_TIMEOUT_SECONDS", "5")
+)
+CLIO_GROW_MAX_CONNECTIONS = int(os.getenv("CLIO_GROW_MAX_CONNECTIONS", "200"))
+CLIO_GROW_MAX_KEEPALIVE = int(os.getenv("CLIO_GROW_MAX_KEEPALIVE", "50"))
+# Per-envelope fan-out, and the worker-wide cap that protects the Grow budget
+CLIO_GROW_MAX_CONCURRENCY = int(os.getenv("CLIO_GROW_MAX_CONCURRENCY", "8"))
+CLIO_GROW_MAX_IN_FLIGHT = int(os.getenv("CLIO_GROW_MAX_IN_FLIGHT", "100"))
+
+# Accept-then-process intake queue (rows in intake_leads)
+INTAKE_QUEUE_WORKERS = int(os.getenv("INTAKE_QUEUE_WORKERS", "4"))
+INTAKE_QUEUE_BATCH_SIZE = int(os.getenv("INTAKE_QUEUE_BATCH_SIZE", "10"))
+INTAKE_QUEUE_POLL_SECONDS = float(os.getenv("INTAKE_QUEUE_POLL_SECONDS", "2"))
+# A ``submitting`` row claimed longer ago than this is assumed abandoned
+INTAKE_QUEUE_LEASE_SECONDS = float(os.getenv("INTAKE_QUEUE_LEASE_SECONDS", "300"))
+
+# Idempotent intake (dedup of retried submissions)
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+
+# Group-commit writer for intake_leads
+INTAKE_WRITER_BATCH_SIZE = int(os.getenv("INTAKE_WRITER_BATCH_SIZE", "100"))
+INTAKE_WRITER_FLUSH_MS = float(os.getenv("INTAKE_WRITER_FLUSH_MS", "5"))
+
+# Intake logging: level, queued sink and per-event sampling
+# (INTAKE_LOG_SAMPLE_RATES is "event=rate,..." e.g. "payload.detected=0.01")
+INTAKE_LOG_LEVEL = os.getenv("INTAKE_LOG_LEVEL", "INFO")
+INTAKE_LOG_ENQUEUE = os.getenv("INTAKE_LOG_ENQUEUE", "true").lower() == "true"
+INTAKE_LOG_SAMPLE_RATE = float(os.getenv("INTAKE_LOG_SAMPLE_RATE", "1.0"))
+INTAKE_LOG_SAMPLE_RATES = os.getenv("INTAKE_LOG_SAMPLE_RATES", "")
+
+# Circuit breaker around Clio Grow submission
+CLIO_GROW_BREAKER_ERROR_RATE = float(os.getenv("CLIO_GROW_BREAKER_ERROR_RATE", "0.5"))
+CLIO_GROW_BREAKER_MIN_CALLS = int(os.getenv("CLIO_GROW_BREAKER_MIN_CALLS", "10"))
+CLIO_GROW_BREAKER_WINDOW_SECONDS = float(
+    os.getenv("CLIO_GROW_BREAKER_WINDOW_SECONDS", "30")
+)
+# Calls slower than this count as failures
+CLIO_GROW_BREAKER_SLOW_CALL_SECONDS = float(
+    os.getenv("CLIO_GROW_BREAKER_SLOW_CALL_SECONDS", "5")
+)
+CLIO_GROW_BREAKER_OPEN_SECONDS = float(
+    os.getenv("CLIO_GROW_BREAKER_OPEN_SECONDS", "30")
+)
+CLIO_GROW_BREAKER_HALF_OPEN_PROBES = int(
+    os.getenv("CLIO_GROW_BREAKER_HALF_OPEN_PROBES", "1")
+)
+
+# Clio API rate-limit budget shared by every worker: "memory" (per process),
+# "sqlite:///path/to/file.db" (processes on one host) or "redis://host:port/db"
+CLIO_RATE_LIMIT_STORE = os.getenv(
+    "CLIO_RATE_LIMIT_STORE", "sqlite:///./clio_rate_limit.db"
+)
+
+# Retries of transient Clio API failures (429, 502-504, connection errors)
+CLIO_API_MAX_RETRIES = int(os.getenv("CLIO_API_MAX_RETRIES", "4"))
+CLIO_API_RETRY_BASE_SECONDS = float(os.getenv("CLIO_API_RETRY_BASE_SECONDS", "0.5"))
+CLIO_API_RETRY_MAX_BACKOFF_SECONDS = float(
+    os.getenv("CLIO_API_RETRY_MAX_BACKOFF_SECONDS", "30")
+)
+# Total time one call may spend on attempts and backoff
+CLIO_API_RETRY_BUDGET_SECONDS = float(os.getenv("CLIO_API_RETRY_BUDGET_SECONDS", "120"))
+
+# Clio API list pages requested concurrently once the page count is known
+CLIO_PAGINATION_PREFETCH = int(os.getenv("CLIO_PAGINATION_PREFETCH", "4"))
+
+# Bulk replay of failed/unsent intake leads
+INTAKE_REPLAY_CONCURRENCY = int(os.getenv("INTAKE_REPLAY_CONCURRENCY", "8"))
+INTAKE_REPLAY_MAX_PER_MINUTE = int(os.getenv("INTAKE_REPLAY_MAX_PER_MINUTE", "300"))
+# Required as "Authorization: Bearer <token>" on /admin endpoints (503 if unset)
+INTAKE_ADMIN_TOKEN = os.getenv("INTAKE_ADMIN_TOKEN", "")
+
+# LRU cache of decoded base64/JSON field values (entries; 0 disables)
+NORMALIZER_CACHE_SIZE = int(os.getenv("NORMALIZER_CACHE_SIZE", "4096"))
+
+# Shared, lifespan-managed HTTP client for the Clio API
+CLIO_HTTP2 = os.getenv("CLIO_HTTP2", "true").lower() == "true"
+CLIO_HTTP_TIMEOUT_SECONDS = float(os.getenv("CLIO_HTTP_TIMEOUT_SECONDS", "30"))
+CLIO_HTTP_CONNECT_TIMEOUT_SECONDS = float(
+    os.getenv("CLIO_HTTP_CONNECT_TIMEOUT_SECONDS", "10")
+)
+CLIO_HTTP_MAX_CONNECTIONS = int(os.getenv("CLIO_HTTP_MAX_CONNECTIONS", "20"))
+CLIO_HTTP_MAX_KEEPALIVE = int(os.getenv("CLIO_HTTP_MAX_KEEPALIVE", "10"))
+CLIO_HTTP_KEEPALIVE_EXPIRY_SECONDS = float(
+    os.getenv("CLIO_HTTP_KEEPALIVE_EXPIRY_SECONDS", "60")
+)
+# Conditional-GET (ETag) cache of Clio API responses: "sqlite:///path/to/file.db",
+# or empty (the default) to disable. The file holds client data (PII); it is
+# created readable by its owner only
+CLIO_HTTP_CACHE = os.getenv("CLIO_HTTP_CACHE", "")
+CLIO_HTTP_CACHE_MAX_ENTRIES = int(os.getenv("CLIO_HTTP_CACHE_MAX_ENTRIES", "10000"))
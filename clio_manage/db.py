@@ -1,11 +1,11 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String, create_engine
+from sqlalchemy import DateTime, Integer, String, create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from clio_manage.config import DATABASE_URL
-from clio_manage.models import Base as ModelsBase
+from clio_manage.models.intake import Base as ModelsBase
 
 # Keep the legacy Base for existing models
 Base = declarative_base()
@@ -32,3 +32,35 @@ def init_db():
     """Initialize both legacy and new model tables."""
     Base.metadata.create_all(bind=engine)
     ModelsBase.metadata.create_all(bind=engine)
+    _add_missing_columns()
+
+
+def _add_missing_columns():
+    """
+    Add nullable columns introduced after a table was first created.
+
+    ``create_all`` never alters existing tables, so older SQLite files would
+    otherwise miss columns such as ``intake_leads.idempotency_key``.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in ModelsBase.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                    )
+                )
+                if column.index:
+                    conn.execute(
+                        text(
+                            f"CREATE INDEX IF NOT EXISTS ix_{table.name}_{column.name} "
+                            f"ON {table.name} ({column.name})"
+                        )
+                    )
@@ -3,14 +3,53 @@ FastAPI integration example for handling multiple payload formats.
 This shows how to use the payload parser in a FastAPI proxy server.
 """
 
-from typing import Any, Dict, List
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, status
 from lead_parser import auto_parse_lead_data
 from loguru import logger
 from pydantic import BaseModel
-from send_intake import create_clio_lead_from_any_payload, post_lead_to_clio_grow_typed
+
+from clio_manage.payload_parser import LeadParseError, stream_envelope_payload
+from clio_manage.routers.intake_admin import router as intake_admin_router
+from clio_manage.routers.intake_status import (
+    AcceptedResult,
+    accept_payload,
+    accepted_response,
+    get_idempotency_key,
+    queue_lead,
+    router as intake_status_router,
+    should_queue,
+)
+from clio_manage.routers.metrics import (
+    router as metrics_router,
+    track_request_latency,
+)
+from clio_manage.services.circuit_breaker import CircuitOpenError
+from clio_manage.services.grow_submission import grow_engine
+from clio_manage.services.idempotency import resolve_key
+from clio_manage.services.intake_queue import intake_queue
+from clio_manage.services.intake_writer import intake_writer
+from clio_manage.utils.auto_normalize import NormalizedJSONRoute
+from clio_manage.utils.intake_logging import (
+    configure_intake_logging,
+    flush_intake_logging,
+    intake_log,
+    request_size,
+)
+from clio_manage.utils.metrics import LEADS, PAYLOADS, time_stage
 
 
 def _flatten_response_list(responses):
@@ -24,12 +63,113 @@ def _flatten_response_list(responses):
     return result
 
 
+async def _process_envelope_lead(
+    item: Tuple[int, Any], idempotency_key: Optional[str] = None
+) -> Tuple[Dict[str, Any], bool]:
+    """Parse and submit one envelope lead, returning (response, created)."""
+    index, lead = item
+    try:
+        try:
+            with time_stage("parse"):
+                bot_data = auto_parse_lead_data(lead)
+        except Exception:
+            LEADS.inc("envelope", "invalid")
+            raise
+        LEADS.inc("envelope", "parsed")
+        response_data, status_code = await grow_engine.submit_lead(
+            bot_data, idempotency_key=resolve_key(bot_data, idempotency_key, index)
+        )
+        return response_data, status_code == 201
+    except CircuitOpenError:
+        return await queue_lead(bot_data, idempotency_key, index), False
+    except Exception as lead_error:
+        logger.error(
+            "Failed to process individual lead",
+            extra={
+                "error": str(lead_error),
+                "lead_data_keys": (
+                    list(lead.keys())
+                    if isinstance(lead, dict)
+                    else "invalid_lead_format"
+                ),
+            },
+        )
+        return {"error": str(lead_error)}, False
+
+
+async def _submit_parsed_lead(
+    item: Tuple[int, Any], idempotency_key: Optional[str] = None
+) -> Tuple[Dict[str, Any], bool]:
+    """Submit one already-parsed lead, returning (response, created)."""
+    index, bot_data = item
+    if isinstance(bot_data, LeadParseError):
+        return {"error": bot_data.error}, False
+    try:
+        response_data, status_code = await grow_engine.submit_lead(
+            bot_data, idempotency_key=resolve_key(bot_data, idempotency_key, index)
+        )
+        return response_data, status_code == 201
+    except CircuitOpenError:
+        return await queue_lead(bot_data, idempotency_key, index), False
+    except Exception as lead_error:
+        logger.error(
+            "Failed to submit streamed lead",
+            extra={"error": str(lead_error), "lead_index": index},
+        )
+        return {"error": str(lead_error)}, False
+
+
+async def _enqueue_parsed_lead(
+    item: Tuple[int, Any], idempotency_key: Optional[str] = None
+) -> Optional[int]:
+    """Queue one already-parsed lead; leads that failed mapping are skipped."""
+    index, bot_data = item
+    if isinstance(bot_data, LeadParseError):
+        return None
+    lead_ids = await intake_queue.enqueue([bot_data], idempotency_key, index)
+    return lead_ids[0]
+
+
+T = TypeVar("T")
+
+
+async def _aenumerate(items: AsyncIterable[T]) -> AsyncIterator[Tuple[int, T]]:
+    """Async counterpart of ``enumerate``."""
+    index = 0
+    async for item in items:
+        yield index, item
+        index += 1
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the intake queue workers; flush writes and close the Grow client."""
+    configure_intake_logging()
+    await intake_queue.start()
+    yield
+    await intake_queue.stop()
+    await intake_writer.stop()
+    await grow_engine.aclose()
+    await flush_intake_logging()
+
+
 app = FastAPI(
     title="Clio Intake Proxy API",
     description="Unified proxy for handling web forms and Capture Now agent payloads",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Webhook bodies are parsed once per request
+app.router.route_class = NormalizedJSONRoute
+
+app.include_router(intake_status_router)
+app.include_router(intake_admin_router)
+app.include_router(metrics_router)
+app.middleware("http")(track_request_latency)
+
+ACCEPTED_RESPONSES = {202: {"model": AcceptedResult}}
+
 
 class GenericPayload(BaseModel):
     """Generic payload that accepts any structure."""
@@ -48,20 +188,30 @@ class ProcessingResult(BaseModel):
     errors: List[str] = []
 
 
-@app.post("/webhook/clio-intake", response_model=ProcessingResult)
-async def receive_intake_payload(payload: Dict[str, Any]):
+@app.post(
+    "/webhook/clio-intake",
+    response_model=ProcessingResult,
+    responses=ACCEPTED_RESPONSES,
+)
+async def receive_intake_payload(payload: Dict[str, Any], request: Request):
     """
     Unified webhook endpoint for receiving intake data from any source.
     Supports:
     - Web form direct payloads
     - Capture Now agent envelope payloads
     - Mixed/flattened payloads
+
+    Send ``Prefer: respond-async`` (or ``?async=true``) to get a 202 with
+    queued lead ids instead of waiting for Clio Grow. Retries carrying the
+    same ``Idempotency-Key`` (or identical lead content) are not resent.
+    While Clio Grow's circuit breaker is open, payloads are always queued.
     """
-    logger.info(
+    intake_log.info(
+        "webhook.received",
         "Received intake webhook",
-        extra={
+        lambda: {
             "payload_keys": list(payload.keys()),
-            "payload_size": len(str(payload)),
+            "payload_size": request_size(request),
             "has_inbox_leads": "inbox_leads" in payload,
             "lead_count": (
                 len(payload.get("inbox_leads", [])) if "inbox_leads" in payload else 1
@@ -69,44 +219,32 @@ async def receive_intake_payload(payload: Dict[str, Any]):
         },
     )
 
+    idempotency_key = get_idempotency_key(request)
+
     try:
+        if should_queue(request):
+            return await accept_payload(payload, idempotency_key)
+
         # Check if payload contains inbox_leads (multiple leads)
         if "inbox_leads" in payload:
             leads = payload["inbox_leads"]
-            results = []
-            successful = 0
-            failed = 0
-
-            for lead in leads:
-                try:
-                    bot_data = auto_parse_lead_data(lead)
-                    response_data, status_code, _ = post_lead_to_clio_grow_typed(
-                        bot_data
-                    )
-                    results.append(response_data)
-                    if status_code == 201:
-                        successful += 1
-                    else:
-                        failed += 1
-                except Exception as lead_error:
-                    logger.error(
-                        "Failed to process individual lead",
-                        extra={
-                            "error": str(lead_error),
-                            "lead_data_keys": (
-                                list(lead.keys())
-                                if isinstance(lead, dict)
-                                else "invalid_lead_format"
-                            ),
-                        },
-                    )
-                    failed += 1
-                    results.append({"error": str(lead_error)})
+            PAYLOADS.inc("envelope")
+
+            # Leads are parsed and submitted concurrently, capped by the
+            # engine's fan-out limit; results come back in envelope order.
+            outcomes = await grow_engine.fan_out(
+                list(enumerate(leads)),
+                partial(_process_envelope_lead, idempotency_key=idempotency_key),
+            )
+            results = [response_data for response_data, _ in outcomes]
+            successful = sum(1 for _, created in outcomes if created)
+            failed = len(leads) - successful
 
             # Log processing summary
-            logger.info(
+            intake_log.info(
+                "webhook.batch_completed",
                 "Batch processing completed",
-                extra={
+                lambda: {
                     "total_leads": len(leads),
                     "successful": successful,
                     "failed": failed,
@@ -126,7 +264,9 @@ async def receive_intake_payload(payload: Dict[str, Any]):
             )
         else:
             # Single lead processing - fallback to original logic
-            response_data, status_code, _ = create_clio_lead_from_any_payload(payload)
+            response_data, status_code = await grow_engine.submit_any_payload(
+                payload, idempotency_key=idempotency_key
+            )
 
             # Handle batch-style response (very rare on this path)
             if (
@@ -151,6 +291,9 @@ async def receive_intake_payload(payload: Dict[str, Any]):
                     clio_responses=_flatten_response_list([response_data]),
                     errors=[] if status_code == 201 else [str(response_data)],
                 )
+    except CircuitOpenError:
+        # Clio Grow went down mid-request; queue the lead instead of failing
+        return await accept_payload(payload, idempotency_key)
     except Exception as e:
         logger.error(
             "Webhook processing failed",
@@ -169,13 +312,17 @@ async def receive_intake_payload(payload: Dict[str, Any]):
         )
 
 
-@app.post("/webhook/direct", response_model=ProcessingResult)
-async def receive_direct_payload(payload: Dict[str, Any]):
+@app.post(
+    "/webhook/direct", response_model=ProcessingResult, responses=ACCEPTED_RESPONSES
+)
+async def receive_direct_payload(payload: Dict[str, Any], request: Request):
     """
     Endpoint specifically for direct payloads from web forms.
     """
-    logger.info(
-        "Received direct payload", extra={"has_inbox_lead": "inbox_lead" in payload}
+    intake_log.info(
+        "webhook.direct",
+        "Received direct payload",
+        lambda: {"has_inbox_lead": "inbox_lead" in payload},
     )
 
     if "inbox_lead" not in payload:
@@ -183,16 +330,20 @@ async def receive_direct_payload(payload: Dict[str, Any]):
             status_code=422, detail="Direct payload must contain 'inbox_lead' field"
         )
 
-    return await receive_intake_payload(payload)
+    return await receive_intake_payload(payload, request)
 
 
-@app.post("/webhook/envelope", response_model=ProcessingResult)
-async def receive_envelope_payload(payload: Dict[str, Any]):
+@app.post(
+    "/webhook/envelope", response_model=ProcessingResult, responses=ACCEPTED_RESPONSES
+)
+async def receive_envelope_payload(payload: Dict[str, Any], request: Request):
     """
     Endpoint specifically for envelope payloads from Capture Now agent.
     """
-    logger.info(
-        "Received envelope payload", extra={"has_inbox_leads": "inbox_leads" in payload}
+    intake_log.info(
+        "webhook.envelope",
+        "Received envelope payload",
+        lambda: {"has_inbox_leads": "inbox_leads" in payload},
     )
 
     if "inbox_leads" not in payload:
@@ -200,7 +351,61 @@ async def receive_envelope_payload(payload: Dict[str, Any]):
             status_code=422, detail="Envelope payload must contain 'inbox_leads' field"
         )
 
-    return await receive_intake_payload(payload)
+    return await receive_intake_payload(payload, request)
+
+
+@app.post(
+    "/webhook/envelope/stream",
+    response_model=ProcessingResult,
+    responses=ACCEPTED_RESPONSES,
+)
+async def receive_envelope_stream(request: Request):
+    """
+    Streaming endpoint for very large envelope payloads.
+
+    The request body is parsed incrementally and each ``inbox_leads`` element
+    is submitted (or queued, with ``Prefer: respond-async``) as soon as it has
+    arrived, so work starts before the upload finishes and memory stays flat.
+    """
+    idempotency_key = get_idempotency_key(request)
+    leads = _aenumerate(stream_envelope_payload(request.stream()))
+
+    try:
+        if should_queue(request):
+            queued = await grow_engine.fan_out_stream(
+                leads, partial(_enqueue_parsed_lead, idempotency_key=idempotency_key)
+            )
+            # Like non-streamed async payloads, invalid leads are not queued
+            return accepted_response([i for i in queued if i is not None])
+
+        outcomes = await grow_engine.fan_out_stream(
+            leads, partial(_submit_parsed_lead, idempotency_key=idempotency_key)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid envelope payload: {str(e)}",
+        )
+
+    successful = sum(1 for _, created in outcomes if created)
+    intake_log.info(
+        "webhook.batch_completed",
+        "Streamed batch processing completed",
+        lambda: {
+            "total_leads": len(outcomes),
+            "successful": successful,
+            "payload_size": request_size(request),
+        },
+    )
+
+    return ProcessingResult(
+        success=successful == len(outcomes),
+        total_leads=len(outcomes),
+        successful_leads=successful,
+        failed_leads=len(outcomes) - successful,
+        clio_responses=[response_data for response_data, _ in outcomes],
+        errors=[],
+    )
 
 
 @app.get("/health")
@@ -219,7 +424,11 @@ async def root():
             "/webhook/clio-intake": "Unified endpoint for any payload format",
             "/webhook/direct": "Direct payloads from web forms",
             "/webhook/envelope": "Envelope payloads from Capture Now agent",
+            "/webhook/envelope/stream": "Large envelopes, parsed as they stream in",
+            "/webhook/status/{lead_id}": "Outcome of a lead accepted with 202",
             "/health": "Health check",
+            "/admin/intake/replay": "Resubmit failed or unsent leads",
+            "/metrics": "Prometheus metrics for the intake pipeline",
             "/docs": "API documentation",
         },
     }
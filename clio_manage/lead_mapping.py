@@ -0,0 +1,255 @@
+"""
+Declarative, compiled field mapping for intake payloads.
+
+Each supported payload format (direct, envelope, mixed) is described by a
+table of output field -> source paths. The tables are compiled once at import
+time into plain extractor functions, so a lead is mapped in a single pass over
+the raw dict and validated exactly once, as ``BotDataInput``. This replaces the
+``DirectPayload``/``CaptureNowEnvelope``/``CaptureNowInboxLead`` ->
+``BotDataInput`` -> ``ClioInboxLead`` chain used by ``PayloadParser``.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from app.schemas import BotDataInput
+from loguru import logger
+
+from clio_manage.utils.metrics import LEADS
+
+Scope = Dict[str, Any]
+Extractor = Callable[[Scope], Dict[str, Any]]
+
+
+def extract_message(message: Any) -> Optional[str]:
+    """
+    Extract message string from various formats.
+    Capture Now agent sometimes sends message: false instead of actual message.
+    """
+    if isinstance(message, str):
+        return message.strip() or None
+    if message is None or message is False:
+        return None
+    return str(message)
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """
+    How to produce one output field.
+
+    ``sources`` are dotted paths into the scope, tried in order; the first
+    truthy value (after ``transform``) wins. Otherwise ``fallback(scope)`` is
+    used if given, then ``default``.
+    """
+
+    sources: Tuple[str, ...]
+    default: Any = None
+    transform: Optional[Callable[[Any], Any]] = None
+    fallback: Optional[Callable[[Scope], Any]] = None
+
+
+def _envelope_referring_url(scope: Scope) -> str:
+    if scope["lead"].get("call_recording_url"):
+        return "https://capture-now-agent.com/call"
+    return "https://intake-system.local"
+
+
+# Output fields are the BotDataInput fields
+DIRECT_FIELD_MAP: Dict[str, FieldRule] = {
+    "first_name": FieldRule(("inbox_lead.from_first",), ""),
+    "last_name": FieldRule(("inbox_lead.from_last",), ""),
+    "message": FieldRule(("inbox_lead.from_message",), ""),
+    "email": FieldRule(("inbox_lead.from_email",)),
+    "phone_number": FieldRule(("inbox_lead.from_phone",)),
+    "referring_url": FieldRule(("inbox_lead.referring_url",), "https://unknown.com"),
+    "source": FieldRule(("inbox_lead.from_source",), "Unknown Source"),
+}
+
+ENVELOPE_FIELD_MAP: Dict[str, FieldRule] = {
+    "first_name": FieldRule(("lead.first_name", "envelope.first_name"), "Unknown"),
+    "last_name": FieldRule(("lead.last_name", "envelope.last_name"), "Contact"),
+    "message": FieldRule(
+        ("lead.message", "envelope.message"),
+        "Voice agent intake submission",
+        transform=extract_message,
+    ),
+    "email": FieldRule(("lead.email", "envelope.email")),
+    "phone_number": FieldRule(("lead.phone_number", "envelope.phone_number")),
+    "referring_url": FieldRule(
+        ("lead.referring_url", "envelope.referring_url"),
+        fallback=_envelope_referring_url,
+    ),
+    "source": FieldRule(("lead.source", "envelope.source"), "Capture Now Agent"),
+}
+
+MIXED_FIELD_MAP: Dict[str, FieldRule] = {
+    "first_name": FieldRule(("payload.first_name",), "Unknown"),
+    "last_name": FieldRule(("payload.last_name",), "Contact"),
+    "message": FieldRule(
+        ("payload.message",),
+        "Voice agent intake submission",
+        transform=extract_message,
+    ),
+    "email": FieldRule(("payload.email",)),
+    "phone_number": FieldRule(("payload.phone_number",)),
+    "referring_url": FieldRule(
+        ("payload.referring_url",), "https://intake-system.local"
+    ),
+    "source": FieldRule(("payload.source",), "Mixed Payload Source"),
+}
+
+# BotDataInput field -> Clio Grow inbox_lead field
+CLIO_FIELD_MAP: Dict[str, str] = {
+    "first_name": "from_first",
+    "last_name": "from_last",
+    "message": "from_message",
+    "email": "from_email",
+    "phone_number": "from_phone",
+    "referring_url": "referring_url",
+    "source": "from_source",
+}
+
+
+def _compile_path(path: str) -> Callable[[Scope], Any]:
+    keys = tuple(path.split("."))
+
+    def get(scope: Scope) -> Any:
+        value: Any = scope
+        for key in keys:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+
+    return get
+
+
+def _compile_rule(rule: FieldRule) -> Callable[[Scope], Any]:
+    getters = tuple(_compile_path(path) for path in rule.sources)
+    transform, fallback, default = rule.transform, rule.fallback, rule.default
+
+    def get(scope: Scope) -> Any:
+        for getter in getters:
+            value = getter(scope)
+            if transform is not None:
+                value = transform(value)
+            if value:
+                return value
+        return fallback(scope) if fallback is not None else default
+
+    return get
+
+
+def compile_mapping(table: Dict[str, FieldRule]) -> Extractor:
+    """Compile a field-mapping table into a single-pass extractor."""
+    fields = tuple((name, _compile_rule(rule)) for name, rule in table.items())
+
+    def extract(scope: Scope) -> Dict[str, Any]:
+        return {name: get(scope) for name, get in fields}
+
+    return extract
+
+
+class CompiledLeadMapper:
+    """Maps raw intake payloads to validated ``BotDataInput`` in one pass."""
+
+    def __init__(
+        self,
+        direct: Dict[str, FieldRule] = DIRECT_FIELD_MAP,
+        envelope: Dict[str, FieldRule] = ENVELOPE_FIELD_MAP,
+        mixed: Dict[str, FieldRule] = MIXED_FIELD_MAP,
+    ):
+        self._direct = compile_mapping(direct)
+        self._envelope = compile_mapping(envelope)
+        self._mixed = compile_mapping(mixed)
+
+    def map_direct(self, payload: Dict[str, Any]) -> BotDataInput:
+        """Map a direct web form payload (``inbox_lead`` + token)."""
+        if not isinstance(payload.get("inbox_lead"), dict):
+            LEADS.inc("direct", "invalid")
+            raise ValueError("Invalid direct payload: inbox_lead must be an object")
+        try:
+            return _validate("direct", self._direct(payload))
+        except Exception as e:
+            raise ValueError(f"Invalid direct payload: {e}")
+
+    def map_envelope(self, payload: Dict[str, Any]) -> List[BotDataInput]:
+        """Map every lead of an envelope; leads that fail validation are skipped."""
+        leads = payload.get("inbox_leads")
+        if leads is None:
+            return []
+        if not isinstance(leads, list):
+            raise ValueError("Invalid envelope payload: inbox_leads must be a list")
+
+        parsed_leads = []
+        for i, lead in enumerate(leads):
+            try:
+                parsed_leads.append(self.map_envelope_lead(lead, payload))
+            except Exception as e:
+                logger.error(
+                    f"Failed to parse envelope lead {i+1}", extra={"error": str(e)}
+                )
+        return parsed_leads
+
+    def map_envelope_lead(
+        self, lead: Dict[str, Any], envelope: Dict[str, Any]
+    ) -> BotDataInput:
+        """Map one ``inbox_leads`` element, falling back to envelope fields."""
+        if not isinstance(lead, dict):
+            LEADS.inc("envelope", "invalid")
+            raise ValueError("Envelope lead must be an object")
+        return _validate(
+            "envelope", self._envelope({"lead": lead, "envelope": envelope})
+        )
+
+    def map_mixed(self, payload: Dict[str, Any]) -> BotDataInput:
+        """Map a mixed/flattened payload with lead fields at root level."""
+        try:
+            return _validate("mixed", self._mixed({"payload": payload}))
+        except Exception as e:
+            raise ValueError(f"Invalid mixed payload: {e}")
+
+    def map_payload(
+        self, payload: Dict[str, Any], payload_type: str
+    ) -> Union[BotDataInput, List[BotDataInput]]:
+        """Map a payload whose type was found by ``detect_payload_type``."""
+        if payload_type == "direct":
+            return self.map_direct(payload)
+        if payload_type == "envelope":
+            return self.map_envelope(payload)
+        if payload_type == "mixed":
+            return self.map_mixed(payload)
+        raise ValueError(f"Unknown payload format. Keys: {list(payload.keys())}")
+
+
+def _validate(payload_type: str, fields: Dict[str, Any]) -> BotDataInput:
+    """The single validation step, counted per payload type and outcome."""
+    try:
+        lead = BotDataInput.model_validate(fields)
+    except Exception:
+        LEADS.inc(payload_type, "invalid")
+        raise
+    LEADS.inc(payload_type, "parsed")
+    return lead
+
+
+def to_clio_payload(bot_data: BotDataInput) -> Dict[str, Any]:
+    """
+    Build the Clio Grow ``inbox_lead`` body from an already validated lead.
+
+    Equivalent to ``normalize_to_clio_format(bot_data).model_dump()`` without
+    validating the same values a second time.
+    """
+    clio_lead = {
+        clio_field: getattr(bot_data, field)
+        for field, clio_field in CLIO_FIELD_MAP.items()
+    }
+    clio_lead["from_email"] = clio_lead["from_email"] or ""
+    clio_lead["from_phone"] = clio_lead["from_phone"] or ""
+    clio_lead["referring_url"] = str(clio_lead["referring_url"])
+    return clio_lead
+
+
+# Compiled once at import time
+lead_mapper = CompiledLeadMapper()
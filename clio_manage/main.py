@@ -1,8 +1,19 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from clio_manage.routers import api_router
+from clio_manage.services.http_transport import clio_transport
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release the pooled Clio API connections
+    await clio_transport.aclose()
+
 
-app = FastAPI(title="Clio Manage Backend API")
+app = FastAPI(title="Clio Manage Backend API", lifespan=lifespan)
 
 app.include_router(api_router, prefix="/api")
 
@@ -6,10 +6,10 @@ import logging
 import os
 from contextlib import asynccontextmanager
 
-import httpx
-
 from clio_manage.routers.auth_routes import router as auth_router
+from clio_manage.routers.metrics import router as metrics_router
 from clio_manage.routers.triage_routes import router as triage_router
+from clio_manage.services.http_transport import PooledTransport, clio_transport
 
 try:
     from api.analytics_router import router as analytics_router
@@ -23,6 +23,9 @@ from fastapi.responses import RedirectResponse
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Streamlit runs next to this backend; reuse keep-alive connections to it
+streamlit_transport = PooledTransport("streamlit", http2=False, timeout=30)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -45,6 +48,8 @@ async def lifespan(app: FastAPI):
 
     yield
     logger.info("⏹️ Shutting down backend")
+    await clio_transport.aclose()
+    await streamlit_transport.aclose()
 
 
 # Initialize FastAPI app
@@ -66,6 +71,9 @@ app.add_middleware(
 
 from clio_manage.routers.analytics_router import router as analytics_router
 
+# Prometheus metrics, including outbound connection pool gauges
+app.include_router(metrics_router)
+
 # Register authentication routes
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 
@@ -142,9 +150,8 @@ async def proxy_to_streamlit(path: str, request: Request):
     logger.info(f"🔄 Proxying to Streamlit: {target_url}")
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(target_url, timeout=30)
-            return response.content
+        response = await streamlit_transport.client.get(target_url)
+        return response.content
     except Exception as e:
         logger.error(f"❌ Proxy error: {e}")
         return {"error": "Failed to proxy to Streamlit"}
@@ -166,9 +173,8 @@ async def proxy_root_to_streamlit(request: Request):
     logger.info(f"🔄 Proxying root to Streamlit: {target_url}")
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(target_url, timeout=30)
-            return response.content
+        response = await streamlit_transport.client.get(target_url)
+        return response.content
     except Exception as e:
         logger.error(f"❌ Proxy error: {e}")
         return {"error": "Failed to proxy to Streamlit"}
@@ -1,5 +1,5 @@
 """
-SQLAlchemy 2.0 models for storing intake leads, contacts, custom actions, and webhooks.
+SQLAlchemy 2.0 models for storing Clio contacts, custom actions, and webhooks.
 """
 
 from datetime import datetime
@@ -15,70 +15,6 @@ class Base(DeclarativeBase):
     pass
 
 
-class IntakeLead(Base):
-    """SQLAlchemy model for storing intake lead data."""
-
-    __tablename__ = "intake_leads"
-
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-
-    # Contact information
-    first_name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
-    last_name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
-    email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
-    phone_number: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
-
-    # Lead content
-    message: Mapped[str] = mapped_column(Text, nullable=False)
-    referring_url: Mapped[str] = mapped_column(String(500), nullable=False)
-    source: Mapped[str] = mapped_column(
-        String(100), nullable=False, default="Capture Now Bot"
-    )
-
-    # Clio integration tracking
-    clio_lead_id: Mapped[Optional[int]] = mapped_column(
-        Integer, nullable=True, index=True
-    )
-    clio_status: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
-    clio_sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-    clio_response: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-
-    # Metadata
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, server_default=func.now(), index=True
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, server_default=func.now(), onupdate=func.now()
-    )
-
-    def __repr__(self) -> str:
-        return f"<IntakeLead(id={self.id}, name='{self.first_name} {self.last_name}', source='{self.source}')>"
-
-    @property
-    def full_name(self) -> str:
-        """Return the full name of the contact."""
-        return f"{self.first_name} {self.last_name}"
-
-    def to_bot_data(self) -> dict:
-        """Convert model to bot_data format for Clio API."""
-        return {
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "message": self.message,
-            "email": self.email,
-            "phone_number": self.phone_number,
-            "referring_url": self.referring_url,
-            "source": self.source,
-        }
-
-    def mark_sent_to_clio(self, clio_lead_id: int, status: str, response: str) -> None:
-        """Mark the lead as sent to Clio with response details."""
-        self.clio_lead_id = clio_lead_id
-        self.clio_status = status
-        self.clio_sent_at = datetime.utcnow()
-        self.clio_response = response
-
-
 class InboxLeadToken(Base):
     """SQLAlchemy model for storing Clio inbox lead tokens."""
 
@@ -5,3 +5,10 @@ from .analytics import (
     QualifiedLead,
     TriageCallbackOrUpdate,
 )
+from .intake import (
+    LEAD_STATUS_FAILED,
+    LEAD_STATUS_PENDING,
+    LEAD_STATUS_SENT,
+    LEAD_STATUS_SUBMITTING,
+    IntakeLead,
+)
@@ -3,8 +3,6 @@ from datetime import datetime
 from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import declarative_base
 
-from clio_manage.db import Base
-
 Base = declarative_base()
 
 
@@ -0,0 +1,110 @@
+"""
+Intake lead rows: the durable queue and submission record for Clio Grow.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+
+class Base(DeclarativeBase):
+    """Base class for the intake models."""
+
+    pass
+
+
+# IntakeLead.clio_status values used by the intake queue and idempotency layer
+LEAD_STATUS_PENDING = "pending"
+LEAD_STATUS_SUBMITTING = "submitting"
+LEAD_STATUS_SENT = "sent"
+LEAD_STATUS_FAILED = "failed"
+
+
+class IntakeLead(Base):
+    """SQLAlchemy model for storing intake lead data."""
+
+    __tablename__ = "intake_leads"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    # Contact information
+    first_name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    last_name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
+    phone_number: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+
+    # Lead content
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    referring_url: Mapped[str] = mapped_column(String(500), nullable=False)
+    source: Mapped[str] = mapped_column(
+        String(100), nullable=False, default="Capture Now Bot"
+    )
+
+    # Clio integration tracking
+    clio_lead_id: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, index=True
+    )
+    clio_status: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    clio_sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    clio_response: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # When a queue worker moved the row to ``submitting`` (its lease)
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    # Deduplication of retried submissions (header key or content hash)
+    idempotency_key: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, index=True
+    )
+
+    # Metadata
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now(), index=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<IntakeLead(id={self.id}, name='{self.first_name} {self.last_name}', source='{self.source}')>"
+
+    @property
+    def full_name(self) -> str:
+        """Return the full name of the contact."""
+        return f"{self.first_name} {self.last_name}"
+
+    @classmethod
+    def from_bot_data(cls, bot_data: dict, **fields) -> "IntakeLead":
+        """Build a lead row from bot_data format plus any tracking fields."""
+        return cls(
+            first_name=bot_data["first_name"],
+            last_name=bot_data["last_name"],
+            message=bot_data["message"],
+            email=bot_data.get("email"),
+            phone_number=bot_data.get("phone_number"),
+            referring_url=str(bot_data["referring_url"]),
+            source=bot_data["source"],
+            **fields,
+        )
+
+    def to_bot_data(self) -> dict:
+        """Convert model to bot_data format for Clio API."""
+        return {
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "message": self.message,
+            "email": self.email,
+            "phone_number": self.phone_number,
+            "referring_url": self.referring_url,
+            "source": self.source,
+        }
+
+    def mark_sent_to_clio(
+        self, clio_lead_id: Optional[int], status: str, response: str
+    ) -> None:
+        """Mark the lead as sent to Clio with response details."""
+        self.clio_lead_id = clio_lead_id
+        self.clio_status = status
+        self.clio_sent_at = datetime.utcnow()
+        self.clio_response = response
@@ -7,8 +7,11 @@ This module provides unified parsing for:
 3. Mixed/malformed payloads that need normalization
 """
 
+import json
 import os
-from typing import Any, Dict, List, Optional, Union
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Union
 
 from app.schemas import (
     BotDataInput,
@@ -23,6 +26,10 @@ from app.schemas import (
 from dotenv import load_dotenv
 from loguru import logger
 
+from clio_manage.lead_mapping import lead_mapper
+from clio_manage.utils.intake_logging import intake_log
+from clio_manage.utils.metrics import PAYLOADS, time_stage
+
 load_dotenv()
 load_dotenv(".env")
 load_dotenv("../.env")
@@ -40,24 +47,28 @@ class PayloadParser:
         Returns:
             str: 'direct', 'envelope', 'mixed', or 'unknown'
         """
-        logger.info(
-            "Detecting payload type", extra={"payload_keys": list(payload.keys())}
+        intake_log.debug(
+            "payload.detect",
+            "Detecting payload type",
+            lambda: {"payload_keys": list(payload.keys())},
         )
 
         # Direct payload: has 'inbox_lead' and 'inbox_lead_token' keys
         if "inbox_lead" in payload and "inbox_lead_token" in payload:
-            logger.info("Detected direct payload format")
+            intake_log.info("payload.detected", "Detected direct payload format")
             return "direct"
 
         # Envelope payload: has 'inbox_leads' array
         if "inbox_leads" in payload:
-            logger.info("Detected envelope payload format")
+            intake_log.info("payload.detected", "Detected envelope payload format")
             return "envelope"
 
         # Mixed/flattened payload: has lead fields at root level
         lead_fields = ["first_name", "last_name", "email", "message"]
         if any(field in payload for field in lead_fields):
-            logger.info("Detected mixed/flattened payload format")
+            intake_log.info(
+                "payload.detected", "Detected mixed/flattened payload format"
+            )
             return "mixed"
 
         logger.warning("Unknown payload format detected")
@@ -154,9 +165,11 @@ class PayloadParser:
                     bot_data = BotDataInput(**mapped_data)
                     parsed_leads.append(bot_data)
 
-                    logger.info(
-                        f"Envelope lead {i+1} parsed successfully",
-                        extra={
+                    intake_log.info(
+                        "payload.lead_parsed",
+                        "Envelope lead parsed successfully",
+                        lambda: {
+                            "lead_index": i + 1,
                             "lead_name": f"{mapped_data['first_name']} {mapped_data['last_name']}",
                             "source": mapped_data["source"],
                         },
@@ -282,33 +295,29 @@ def parse_incoming_payload(
     Raises:
         ValueError: If payload cannot be parsed
     """
-    logger.info(
+    # The raw body size is logged by the webhook, which has the request
+    intake_log.info(
+        "payload.parse",
         "Starting payload parsing",
-        extra={
-            "payload_size": len(str(payload)),
-            "top_level_keys": list(payload.keys()),
-        },
+        lambda: {"top_level_keys": list(payload.keys())},
     )
 
-    parser = PayloadParser()
-    payload_type = parser.detect_payload_type(payload)
+    with time_stage("detect"):
+        payload_type = PayloadParser.detect_payload_type(payload)
+    PAYLOADS.inc(payload_type)
 
     try:
-        if payload_type == "direct":
-            return parser.parse_direct_payload(payload)
-
-        elif payload_type == "envelope":
-            return parser.parse_envelope_payload(payload)
-
-        elif payload_type == "mixed":
-            return parser.parse_mixed_payload(payload)
-
-        else:
+        if payload_type == "unknown":
             logger.error(
                 "Cannot parse unknown payload format", extra={"payload": payload}
             )
             raise ValueError(f"Unknown payload format. Keys: {list(payload.keys())}")
 
+        # Single-pass compiled mapping; PayloadParser's per-format methods
+        # remain for callers that need the intermediate models
+        with time_stage("parse"):
+            return lead_mapper.map_payload(payload, payload_type)
+
     except Exception as e:
         logger.error(
             "Payload parsing failed",
@@ -317,6 +326,185 @@ def parse_incoming_payload(
         raise
 
 
+# Structural JSON characters, and the body of a string up to its closing quote
+_JSON_STRUCTURAL = re.compile(rb'[{}\[\]",:]')
+_JSON_STRING_BODY = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*')
+# Anything but JSON whitespace
+_JSON_NON_WHITESPACE = re.compile(rb"[^ \t\r\n]")
+
+
+class EnvelopeStreamDecoder:
+    """
+    Incremental decoder for envelope payloads.
+
+    Bytes are fed in as they arrive and each element of ``inbox_leads`` is
+    returned as a dict as soon as its closing brace is seen. Only the lead
+    currently being received is buffered, so memory stays flat no matter how
+    many leads the envelope carries. Root-level keys are collected into
+    ``root`` as they complete. Like ``json.loads``, only whitespace may
+    surround the root object.
+    """
+
+    def __init__(self, leads_key: str = "inbox_leads"):
+        self.leads_key = leads_key
+        self.root: Dict[str, Any] = {}
+        self.leads_seen = 0
+        self.complete = False
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._expect_key = False
+        self._in_leads = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._lead_start: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """Consume a chunk and return the leads completed by it."""
+        self._buf.extend(chunk)
+        leads: List[Dict[str, Any]] = []
+        buf = self._buf
+
+        while not self.complete:
+            if self._in_string:
+                end = _JSON_STRING_BODY.match(buf, self._pos).end()
+                if end >= len(buf) or buf[end] != 0x22:
+                    # Wait for more data; resume after the scanned prefix
+                    self._pos = end
+                    break
+                self._pos = end + 1
+                self._in_string = False
+                if self._key_start is not None:
+                    self._key = json.loads(buf[self._key_start : self._pos])
+                    self._key_start = None
+                continue
+
+            match = _JSON_STRUCTURAL.search(buf, self._pos)
+            if self._depth == 0:
+                self._check_blank(len(buf) if match is None else match.start())
+            if match is None:
+                self._pos = len(buf)
+                break
+            start, char = match.start(), buf[match.start()]
+            self._pos = start + 1
+            if self._depth == 0 and char != 0x7B:
+                raise ValueError("Envelope payload must be a JSON object")
+
+            if char == 0x22:  # "
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_start = start
+            elif char in (0x7B, 0x5B):  # { [
+                if self._depth == 0:
+                    self._expect_key = True
+                elif self._depth == 1 and self._key == self.leads_key:
+                    self._in_leads = char == 0x5B
+                    self._value_start = None if self._in_leads else self._value_start
+                elif self._depth == 2 and self._in_leads and char == 0x7B:
+                    self._lead_start = start
+                self._depth += 1
+            elif char in (0x7D, 0x5D):  # } ]
+                self._depth -= 1
+                if self._depth == 2 and self._lead_start is not None:
+                    leads.append(json.loads(buf[self._lead_start : self._pos]))
+                    self._lead_start = None
+                    self.leads_seen += 1
+                    self._compact()
+                    buf = self._buf
+                elif self._depth == 1 and self._in_leads:
+                    self._in_leads = False
+                elif self._depth == 0:
+                    self._finish_root_value(start)
+                    self.complete = True
+            elif self._depth == 1 and char == 0x3A:  # :
+                self._expect_key = False
+                self._value_start = self._pos
+            elif self._depth == 1 and char == 0x2C:  # ,
+                self._finish_root_value(start)
+                self._expect_key = True
+
+        if self.complete:
+            self._check_blank(len(buf))
+            del buf[:]
+            self._pos = 0
+        return leads
+
+    def close(self) -> None:
+        """Raise if the stream ended before the envelope was complete."""
+        if not self.complete:
+            raise ValueError("Envelope payload ended before it was complete")
+
+    def _check_blank(self, end: int) -> None:
+        """Raise if anything but whitespace sits outside the root object."""
+        if _JSON_NON_WHITESPACE.search(self._buf, self._pos, end):
+            raise ValueError("Envelope payload has extra data outside the JSON object")
+
+    def _finish_root_value(self, end: int) -> None:
+        if self._value_start is not None and self._key is not None:
+            self.root[self._key] = json.loads(self._buf[self._value_start : end])
+        self._value_start = None
+        self._compact()
+
+    def _compact(self) -> None:
+        """Drop consumed bytes once nothing still points into them."""
+        if self._value_start is None and self._lead_start is None:
+            del self._buf[: self._pos]
+            self._pos = 0
+
+
+@dataclass
+class LeadParseError:
+    """Yielded in place of a streamed envelope lead that could not be mapped."""
+
+    index: int
+    error: str
+
+
+async def stream_envelope_payload(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[Union[BotDataInput, LeadParseError]]:
+    """
+    Parse an envelope payload from a byte stream, one lead at a time.
+
+    Each ``inbox_leads`` element is mapped to ``BotDataInput`` as soon as it
+    has arrived, so callers can start submitting before the body ends.
+    Envelope-level fallbacks (name, message, source, ...) are taken from
+    root keys that precede ``inbox_leads`` in the body. A lead that fails
+    mapping yields a ``LeadParseError`` so callers can count it as failed.
+
+    Raises:
+        ValueError: If the body is not a complete JSON envelope object
+    """
+    decoder = EnvelopeStreamDecoder()
+    PAYLOADS.inc("envelope_stream")
+    index = 0
+
+    async for chunk in chunks:
+        # One chunk can complete several leads, so count them here rather
+        # than reading decoder.leads_seen
+        for lead_data in decoder.feed(chunk):
+            try:
+                with time_stage("parse"):
+                    lead = lead_mapper.map_envelope_lead(lead_data, decoder.root)
+            except Exception as e:
+                logger.error(
+                    f"Failed to parse streamed envelope lead {index + 1}",
+                    extra={"error": str(e)},
+                )
+                lead = LeadParseError(index, str(e))
+            index += 1
+            yield lead
+
+    decoder.close()
+    intake_log.info(
+        "payload.parsed",
+        "Streamed envelope payload parsed",
+        lambda: {"total_leads": decoder.leads_seen},
+    )
+
+
 def normalize_to_clio_format(bot_data: BotDataInput) -> ClioInboxLead:
     """
     Convert internal BotDataInput to Clio API format.
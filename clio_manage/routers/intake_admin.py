@@ -0,0 +1,82 @@
+"""
+Admin endpoints for re-driving intake leads.
+"""
+
+import hmac
+import json
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from clio_manage import config
+from clio_manage.services.intake_replay import (
+    REPLAY_STATUSES,
+    ReplayFilter,
+    intake_replayer,
+)
+
+
+def require_admin_token(authorization: Optional[str] = Header(None)) -> None:
+    """
+    Check ``Authorization: Bearer <INTAKE_ADMIN_TOKEN>``.
+
+    The admin API is disabled (503) until a token is configured.
+    """
+    if not config.INTAKE_ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=503, detail="Admin API disabled: INTAKE_ADMIN_TOKEN not set"
+        )
+    expected = f"Bearer {config.INTAKE_ADMIN_TOKEN}".encode("utf-8")
+    if not hmac.compare_digest((authorization or "").encode("utf-8"), expected):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(
+    prefix="/admin/intake",
+    tags=["Intake Admin"],
+    dependencies=[Depends(require_admin_token)],
+)
+
+
+class ReplayRequest(BaseModel):
+    """Filters for a bulk replay; ``unsent`` means never submitted."""
+
+    statuses: List[str] = list(REPLAY_STATUSES)
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    source: Optional[str] = None
+    limit: Optional[int] = None
+    dry_run: bool = False
+
+
+@router.post("/replay")
+async def replay_leads(request: ReplayRequest):
+    """
+    Resubmit failed or unsent leads to Clio Grow.
+
+    Progress is streamed as newline-delimited JSON events. With
+    ``dry_run`` only the number of matching leads is returned.
+    """
+    filters = ReplayFilter(
+        statuses=request.statuses,
+        since=request.since,
+        until=request.until,
+        source=request.source,
+        limit=request.limit,
+    )
+    try:
+        filters.conditions()
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if request.dry_run:
+        return {"total": await intake_replayer.count(filters)}
+
+    async def events():
+        async for event in intake_replayer.replay(filters):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
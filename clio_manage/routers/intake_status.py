@@ -0,0 +1,96 @@
+"""
+Accept-then-process (202) support for the intake webhooks.
+
+Callers opt in with ``Prefer: respond-async`` or ``?async=true``; the payload
+is queued in ``intake_leads`` and the submission outcome can be polled from
+``/webhook/status/{lead_id}``. Payloads are also queued, whatever the
+caller asked for, while Clio Grow's circuit breaker is open.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from clio_manage.services.intake_queue import intake_queue
+
+router = APIRouter(prefix="/webhook", tags=["Intake Queue"])
+
+
+class AcceptedResult(BaseModel):
+    """Response returned when a payload is queued for background submission."""
+
+    status: str = "accepted"
+    total_leads: int
+    lead_ids: List[int]
+    status_urls: List[str]
+
+
+class LeadStatus(BaseModel):
+    """Submission outcome of a queued lead."""
+
+    lead_id: int
+    status: Optional[str] = None
+    clio_lead_id: Optional[int] = None
+    clio_sent_at: Optional[str] = None
+    clio_response: Optional[Any] = None
+
+
+def wants_async(request: Request) -> bool:
+    """Check whether the caller asked for accept-then-process handling."""
+    prefer = request.headers.get("prefer", "")
+    if "respond-async" in prefer.lower():
+        return True
+    return request.query_params.get("async", "").lower() in ("1", "true", "yes")
+
+
+def should_queue(request: Request) -> bool:
+    """Queue instead of submitting inline if asked to, or if Grow is down."""
+    return wants_async(request) or intake_queue.engine.breaker.rejecting
+
+
+def get_idempotency_key(request: Request) -> Optional[str]:
+    """Return the caller's ``Idempotency-Key`` header, if any."""
+    return request.headers.get("idempotency-key") or None
+
+
+async def accept_payload(
+    payload: Dict[str, Any], idempotency_key: Optional[str] = None
+) -> JSONResponse:
+    """Queue a payload of any supported format and return a 202 response."""
+    lead_ids = await intake_queue.enqueue_payload(payload, idempotency_key)
+    return accepted_response(lead_ids)
+
+
+async def queue_lead(
+    bot_data: Any, idempotency_key: Optional[str], index: int = 0
+) -> Dict[str, Any]:
+    """Queue one lead of a payload (e.g. when Grow's circuit opened on it)."""
+    lead_id = (await intake_queue.enqueue([bot_data], idempotency_key, index))[0]
+    return {
+        "status": "queued",
+        "lead_id": lead_id,
+        "status_url": f"/webhook/status/{lead_id}",
+    }
+
+
+def accepted_response(lead_ids: List[int]) -> JSONResponse:
+    """Build the 202 response for leads that have been queued."""
+    result = AcceptedResult(
+        total_leads=len(lead_ids),
+        lead_ids=lead_ids,
+        status_urls=[f"/webhook/status/{lead_id}" for lead_id in lead_ids],
+    )
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED, content=result.model_dump()
+    )
+
+
+@router.get("/status/{lead_id}", response_model=LeadStatus)
+async def get_lead_status(lead_id: int):
+    """Report the Clio Grow submission outcome of a queued lead."""
+    lead_status = await intake_queue.get_status(lead_id)
+    if lead_status is None:
+        raise HTTPException(status_code=404, detail="Lead not found")
+    return lead_status
@@ -1,6 +1,5 @@
 from datetime import datetime
 
-import httpx
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
@@ -27,19 +26,16 @@ class TriageRequest(BaseModel):
 @router.post("/lead_review")
 async def lead_review(request: TriageRequest):
     try:
-        async with httpx.AsyncClient() as client:
-            result = await triage_service.triage_lead(
-                client=client,
-                lead_data=request.lead.dict(),
-                note_content=request.note,
-                assignee_id=request.assignee_id,
-                due_at=(
-                    datetime.fromisoformat(request.due_at) if request.due_at else None
-                ),
-                communication_body=request.communication_body,
-                lead_tag_id=request.lead_tag_id,
-                notify_email=request.notify_email,
-            )
+        result = await triage_service.triage_lead(
+            client=None,
+            lead_data=request.lead.dict(),
+            note_content=request.note,
+            assignee_id=request.assignee_id,
+            due_at=datetime.fromisoformat(request.due_at) if request.due_at else None,
+            communication_body=request.communication_body,
+            lead_tag_id=request.lead_tag_id,
+            notify_email=request.notify_email,
+        )
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
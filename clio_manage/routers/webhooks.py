@@ -1,6 +1,10 @@
 from fastapi import APIRouter, Request
 
-router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
+from clio_manage.utils.auto_normalize import NormalizedJSONRoute
+
+router = APIRouter(
+    prefix="/webhooks", tags=["Webhooks"], route_class=NormalizedJSONRoute
+)
 
 
 @router.post("/receive")
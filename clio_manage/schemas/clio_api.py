@@ -65,6 +65,8 @@ class CustomActionUpdate(BaseModel):
 class ContactPhoneNumber(ClioBaseModel):
     """Schema for contact phone numbers."""
 
+    decode_fields = frozenset()
+
     id: Optional[int] = None
     name: Optional[str] = Field(
         None, description="Phone number label (e.g., 'Mobile', 'Work')"
@@ -78,6 +80,8 @@ class ContactPhoneNumber(ClioBaseModel):
 class ContactEmailAddress(ClioBaseModel):
     """Schema for contact email addresses."""
 
+    decode_fields = frozenset()
+
     id: Optional[int] = None
     name: Optional[str] = Field(
         None, description="Email label (e.g., 'Personal', 'Work')"
@@ -91,6 +95,8 @@ class ContactEmailAddress(ClioBaseModel):
 class ContactAddress(ClioBaseModel):
     """Schema for contact addresses."""
 
+    decode_fields = frozenset()
+
     id: Optional[int] = None
     name: Optional[str] = Field(
         None, description="Address label (e.g., 'Home', 'Office')"
@@ -105,6 +111,9 @@ class ContactAddress(ClioBaseModel):
 class Contact(ClioBaseModel):
     """Complete contact schema matching Clio API."""
 
+    # Nested phone/email/address models validate their own fields
+    decode_fields = frozenset({"notes", "errors"})
+
     type: str = Field("Person", description="Contact type (Person, Company)")
 
     # Basic information
@@ -0,0 +1,162 @@
+"""
+Circuit breaker for Clio Grow submission.
+
+The breaker opens when the failure rate over a rolling window crosses a
+threshold (slow calls count as failures), rejects calls while open, and after
+a cool-down lets a few probe calls through (half-open). Successful probes
+close it again; a failed probe re-opens it.
+
+Callers take a permit with ``acquire()`` and report the outcome with
+``record()``. The breaker is only touched from the event loop, so it needs no
+locking.
+"""
+
+import time
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+
+from loguru import logger
+
+from clio_manage import config
+from clio_manage.utils.metrics import registry
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# How long to wait before re-checking while all half-open probes are busy
+HALF_OPEN_RECHECK_SECONDS = 0.5
+
+TRANSITIONS = registry.counter(
+    "intake_circuit_transitions_total",
+    "Circuit breaker state transitions",
+    ("circuit", "state"),
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit is open; retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Error-rate / latency circuit breaker with half-open probing."""
+
+    def __init__(
+        self,
+        name: str,
+        error_rate: Optional[float] = None,
+        min_calls: Optional[int] = None,
+        window_seconds: Optional[float] = None,
+        slow_call_seconds: Optional[float] = None,
+        open_seconds: Optional[float] = None,
+        half_open_probes: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.error_rate = error_rate or config.CLIO_GROW_BREAKER_ERROR_RATE
+        self.min_calls = min_calls or config.CLIO_GROW_BREAKER_MIN_CALLS
+        self.window_seconds = window_seconds or config.CLIO_GROW_BREAKER_WINDOW_SECONDS
+        self.slow_call_seconds = (
+            slow_call_seconds or config.CLIO_GROW_BREAKER_SLOW_CALL_SECONDS
+        )
+        self.open_seconds = open_seconds or config.CLIO_GROW_BREAKER_OPEN_SECONDS
+        self.half_open_probes = (
+            half_open_probes or config.CLIO_GROW_BREAKER_HALF_OPEN_PROBES
+        )
+        self._clock = clock
+        self._state = CLOSED
+        # Bumped on every transition so outcomes of calls started in an
+        # earlier state are ignored
+        self._generation = 0
+        self._opened_at = 0.0
+        self._calls: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    @property
+    def rejecting(self) -> bool:
+        """True unless the circuit is closed (new work should be queued)."""
+        return self.state != CLOSED
+
+    def retry_after(self) -> float:
+        """Seconds until ``acquire()`` could succeed; 0 if it can now."""
+        state = self.state
+        if state == OPEN:
+            return max(self.open_seconds - (self._clock() - self._opened_at), 0.0)
+        if state == HALF_OPEN and self._probes_in_flight >= self.half_open_probes:
+            return HALF_OPEN_RECHECK_SECONDS
+        return 0.0
+
+    def acquire(self) -> int:
+        """
+        Take a permit for one call.
+
+        Returns:
+            A permit to pass to ``record()``
+
+        Raises:
+            CircuitOpenError: If the circuit is open or all probes are busy
+        """
+        state = self.state
+        if state == HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_probes:
+                raise CircuitOpenError(self.name, self.retry_after())
+            self._probes_in_flight += 1
+        elif state == OPEN:
+            raise CircuitOpenError(self.name, self.retry_after())
+        return self._generation
+
+    def record(self, permit: int, success: bool, duration: float) -> None:
+        """Report the outcome of a call made under ``permit``."""
+        if permit != self._generation:
+            return
+        failed = not success or duration >= self.slow_call_seconds
+
+        if self._state == HALF_OPEN:
+            self._probes_in_flight -= 1
+            if failed:
+                self._transition(OPEN)
+            else:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self._transition(CLOSED)
+            return
+
+        now = self._clock()
+        self._calls.append((now, failed))
+        self._failures += failed
+        while self._calls and self._calls[0][0] < now - self.window_seconds:
+            self._failures -= self._calls.popleft()[1]
+
+        if (
+            len(self._calls) >= self.min_calls
+            and self._failures / len(self._calls) >= self.error_rate
+        ):
+            self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        previous, self._state = self._state, state
+        self._generation += 1
+        self._calls.clear()
+        self._failures = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == OPEN:
+            self._opened_at = self._clock()
+        TRANSITIONS.inc(self.name, state)
+        log = logger.warning if state == OPEN else logger.info
+        log(
+            f"{self.name} circuit {previous} -> {state}",
+            extra={"circuit": self.name, "state": state},
+        )
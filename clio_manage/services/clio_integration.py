@@ -4,9 +4,8 @@ Clio API integration service layer.
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-import httpx
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -16,32 +15,61 @@ from clio_manage.utils.clio_api_helpers import clio_api_helper
 logger = logging.getLogger(__name__)
 
 
+def _company_name(company: Any) -> Optional[str]:
+    """Company name from a Clio v4 ``company{id,name}`` object or a plain string."""
+    if isinstance(company, dict):
+        return company.get("name")
+    return company
+
+
 class ClioContactService:
     """Service for managing Clio contacts with local database sync."""
 
-    def __init__(self):
-        self.api_helper = clio_api_helper
+    def __init__(self, api_helper=None):
+        self.api_helper = api_helper or clio_api_helper
 
     async def sync_contacts_from_clio(self, db: AsyncSession) -> int:
-        """Sync all contacts from Clio API to local database."""
-        async with httpx.AsyncClient() as client:
-            try:
-                # Get all contacts from Clio
-                clio_contacts = await self.api_helper.get_all_contacts(client)
+        """
+        Sync all contacts from Clio API to local database.
+
+        Contacts are upserted and committed one Clio page at a time, so memory
+        stays flat however large the firm is and synced rows are visible
+        while the sync runs. If a page fails, pages already committed stay.
+        """
+        synced_count = 0
+        try:
+            async for contacts in self.api_helper.iter_contacts():
+                await self._sync_contact_page(db, contacts)
+                await db.commit()
+                synced_count += len(contacts)
+                logger.info(f"Synced {synced_count} contacts from Clio so far")
 
-                synced_count = 0
-                for contact_data in clio_contacts:
-                    await self._sync_single_contact(db, contact_data)
-                    synced_count += 1
+            logger.info(f"Synced {synced_count} contacts from Clio")
+            return synced_count
 
-                await db.commit()
-                logger.info(f"Synced {synced_count} contacts from Clio")
-                return synced_count
+        except Exception as e:
+            logger.error(
+                f"Error syncing contacts from Clio after {synced_count} contacts: {e}"
+            )
+            await db.rollback()
+            raise
 
-            except Exception as e:
-                logger.error(f"Error syncing contacts from Clio: {e}")
-                await db.rollback()
-                raise
+    async def _sync_contact_page(
+        self, db: AsyncSession, contacts: List[Dict[str, Any]]
+    ) -> None:
+        """Upsert one page of Clio contacts, looking up existing rows in one query."""
+        ids = [data.get("id") for data in contacts if data.get("id") is not None]
+        stmt = select(Contact).where(Contact.clio_contact_id.in_(ids))
+        existing = {
+            contact.clio_contact_id: contact
+            for contact in (await db.execute(stmt)).scalars()
+        }
+        for contact_data in contacts:
+            clio_contact_id = contact_data.get("id")
+            # Recorded so a repeated id later in the page updates, not inserts
+            existing[clio_contact_id] = self._upsert_contact(
+                db, existing.get(clio_contact_id), contact_data
+            )
 
     async def _sync_single_contact(
         self, db: AsyncSession, contact_data: Dict[str, Any]
@@ -54,14 +82,22 @@ class ClioContactService:
         result = await db.execute(stmt)
         existing_contact = result.scalar_one_or_none()
 
-        # Extract contact fields
+        return self._upsert_contact(db, existing_contact, contact_data)
+
+    def _upsert_contact(
+        self,
+        db: AsyncSession,
+        existing_contact: Optional[Contact],
+        contact_data: Dict[str, Any],
+    ) -> Contact:
+        # Extract contact fields (keep CONTACT_CLIO_FIELDS in step with these)
         contact_fields = {
-            "clio_contact_id": clio_contact_id,
+            "clio_contact_id": contact_data.get("id"),
             "first_name": contact_data.get("first_name"),
             "last_name": contact_data.get("last_name"),
-            "email": contact_data.get("email_address"),
-            "phone_number": contact_data.get("phone_number"),
-            "company": contact_data.get("company"),
+            "email": contact_data.get("primary_email_address"),
+            "phone_number": contact_data.get("primary_phone_number"),
+            "company": _company_name(contact_data.get("company")),
             "title": contact_data.get("title"),
             "contact_type": contact_data.get("type", "Person"),
             "is_client": contact_data.get("is_client", False),
@@ -98,62 +134,58 @@ class ClioContactService:
 class ClioCustomActionService:
     """Service for managing Clio custom actions."""
 
-    def __init__(self):
-        self.api_helper = clio_api_helper
+    def __init__(self, api_helper=None):
+        self.api_helper = api_helper or clio_api_helper
 
     async def create_smart_intake_action(self, db: AsyncSession) -> CustomAction:
         """Create the Smart Intake custom action in Clio."""
         action_name = "Open Smart Intake"
         action_url = "https://smartintake.cfelab.com/dashboard?contact_id={contact.id}"
 
-        async with httpx.AsyncClient() as client:
-            try:
-                # Create in Clio
-                clio_response = await self.api_helper.create_custom_action(
-                    client, name=action_name, url=action_url, http_method="GET"
-                )
-
-                # Store locally
-                clio_action_data = clio_response.get("data", {})
-                custom_action = CustomAction(
-                    clio_action_id=clio_action_data.get("id"),
-                    name=action_name,
-                    url=action_url,
-                    http_method="GET",
-                    description="Open Smart Intake dashboard for this contact",
-                )
-
-                db.add(custom_action)
-                await db.commit()
+        try:
+            # Create in Clio
+            clio_response = await self.api_helper.create_custom_action(
+                None, name=action_name, url=action_url, http_method="GET"
+            )
 
-                logger.info(f"Created Smart Intake custom action: {custom_action.id}")
-                return custom_action
+            # Store locally
+            clio_action_data = clio_response.get("data", {})
+            custom_action = CustomAction(
+                clio_action_id=clio_action_data.get("id"),
+                name=action_name,
+                url=action_url,
+                http_method="GET",
+                description="Open Smart Intake dashboard for this contact",
+            )
 
-            except Exception as e:
-                logger.error(f"Error creating Smart Intake custom action: {e}")
-                await db.rollback()
-                raise
+            db.add(custom_action)
+            await db.commit()
+
+            logger.info(f"Created Smart Intake custom action: {custom_action.id}")
+            return custom_action
+
+        except Exception as e:
+            logger.error(f"Error creating Smart Intake custom action: {e}")
+            await db.rollback()
+            raise
 
     async def sync_custom_actions_from_clio(self, db: AsyncSession) -> int:
-        """Sync all custom actions from Clio API to local database."""
-        async with httpx.AsyncClient() as client:
-            try:
-                # Get all custom actions from Clio
-                clio_actions = await self.api_helper.get_all_custom_actions(client)
-
-                synced_count = 0
-                for action_data in clio_actions:
+        """Sync all custom actions from Clio API to local database, page by page."""
+        synced_count = 0
+        try:
+            async for actions in self.api_helper.iter_custom_actions():
+                for action_data in actions:
                     await self._sync_single_custom_action(db, action_data)
-                    synced_count += 1
-
                 await db.commit()
-                logger.info(f"Synced {synced_count} custom actions from Clio")
-                return synced_count
+                synced_count += len(actions)
 
-            except Exception as e:
-                logger.error(f"Error syncing custom actions from Clio: {e}")
-                await db.rollback()
-                raise
+            logger.info(f"Synced {synced_count} custom actions from Clio")
+            return synced_count
+
+        except Exception as e:
+            logger.error(f"Error syncing custom actions from Clio: {e}")
+            await db.rollback()
+            raise
 
     async def _sync_single_custom_action(
         self, db: AsyncSession, action_data: Dict[str, Any]
@@ -166,13 +198,13 @@ class ClioCustomActionService:
         result = await db.execute(stmt)
         existing_action = result.scalar_one_or_none()
 
-        # Extract action fields
+        # Extract action fields (Clio custom actions are always opened with GET;
+        # keep CUSTOM_ACTION_CLIO_FIELDS in step with these)
         action_fields = {
             "clio_action_id": clio_action_id,
-            "name": action_data.get("name"),
-            "url": action_data.get("url"),
-            "http_method": action_data.get("http_method", "GET"),
-            "enabled": action_data.get("enabled", True),
+            "name": action_data.get("label"),
+            "url": action_data.get("target_url"),
+            "http_method": "GET",
         }
 
         if existing_action:
@@ -192,8 +224,8 @@ class ClioCustomActionService:
 class ClioWebhookService:
     """Service for managing Clio webhook subscriptions."""
 
-    def __init__(self):
-        self.api_helper = clio_api_helper
+    def __init__(self, api_helper=None):
+        self.api_helper = api_helper or clio_api_helper
 
     async def create_intake_webhook_subscription(
         self, db: AsyncSession, webhook_url: str
@@ -207,32 +239,31 @@ class ClioWebhookService:
             "matter.created",
         ]
 
-        async with httpx.AsyncClient() as client:
-            try:
-                # Create in Clio
-                clio_response = await self.api_helper.create_webhook_subscription(
-                    client, url=webhook_url, events=events
-                )
-
-                # Store locally
-                clio_subscription_data = clio_response.get("data", {})
-                webhook_subscription = WebhookSubscription(
-                    clio_subscription_id=clio_subscription_data.get("id"),
-                    url=webhook_url,
-                    events=events,
-                    description="Smart Intake webhook for contact and lead events",
-                )
-
-                db.add(webhook_subscription)
-                await db.commit()
+        try:
+            # Create in Clio
+            clio_response = await self.api_helper.create_webhook_subscription(
+                None, url=webhook_url, events=events
+            )
 
-                logger.info(f"Created webhook subscription: {webhook_subscription.id}")
-                return webhook_subscription
+            # Store locally
+            clio_subscription_data = clio_response.get("data", {})
+            webhook_subscription = WebhookSubscription(
+                clio_subscription_id=clio_subscription_data.get("id"),
+                url=webhook_url,
+                events=events,
+                description="Smart Intake webhook for contact and lead events",
+            )
+
+            db.add(webhook_subscription)
+            await db.commit()
 
-            except Exception as e:
-                logger.error(f"Error creating webhook subscription: {e}")
-                await db.rollback()
-                raise
+            logger.info(f"Created webhook subscription: {webhook_subscription.id}")
+            return webhook_subscription
+
+        except Exception as e:
+            logger.error(f"Error creating webhook subscription: {e}")
+            await db.rollback()
+            raise
 
     async def process_webhook_event(
         self, db: AsyncSession, payload: Dict[str, Any]
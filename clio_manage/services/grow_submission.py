@@ -0,0 +1,336 @@
+"""
+Async Clio Grow submission engine for the intake webhooks.
+
+All inbox lead submissions share one pooled ``httpx.AsyncClient`` so the
+intake endpoints can await Clio Grow without blocking the event loop.
+"""
+
+import asyncio
+import time
+from typing import (
+    Any,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+import httpx
+from app.schemas import BotDataInput
+from loguru import logger
+
+from clio_manage import config
+from clio_manage.lead_mapping import to_clio_payload
+from clio_manage.payload_parser import parse_incoming_payload
+from clio_manage.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from clio_manage.services.idempotency import (
+    IdempotencyGuard,
+    idempotency_guard,
+    resolve_key,
+)
+from clio_manage.utils.metrics import SUBMISSIONS, time_stage
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Called with (lead, index) for a batch lead rejected by the open circuit;
+# returns the response reported in place of Clio Grow's
+CircuitOpenHandler = Callable[[BotDataInput, int], Awaitable[Dict[str, Any]]]
+
+
+def extract_lead_id(response_data: Any) -> Optional[int]:
+    """Pull the Clio inbox lead id out of a Grow response, if present."""
+    if not isinstance(response_data, dict):
+        return None
+    if "id" in response_data:
+        return response_data.get("id")
+    inbox_lead = response_data.get("inbox_lead")
+    if isinstance(inbox_lead, dict):
+        return inbox_lead.get("id")
+    return None
+
+
+class GrowSubmissionEngine:
+    """Submits inbox leads to Clio Grow over a shared, connection-pooled client."""
+
+    def __init__(
+        self,
+        inbox_url: Optional[str] = None,
+        inbox_token: Optional[str] = None,
+        timeout: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        idempotency: Optional[IdempotencyGuard] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.inbox_url = inbox_url or config.CLIO_GROW_INBOX_URL
+        self.inbox_token = inbox_token or config.LEAD_INBOX_TOKEN
+        self.timeout = timeout or config.CLIO_GROW_TIMEOUT_SECONDS
+        self.connect_timeout = (
+            connect_timeout or config.CLIO_GROW_CONNECT_TIMEOUT_SECONDS
+        )
+        self.max_connections = max_connections or config.CLIO_GROW_MAX_CONNECTIONS
+        self.max_keepalive = max_keepalive or config.CLIO_GROW_MAX_KEEPALIVE
+        self.max_concurrency = max_concurrency or config.CLIO_GROW_MAX_CONCURRENCY
+        self.max_in_flight = max_in_flight or config.CLIO_GROW_MAX_IN_FLIGHT
+        self.idempotency = idempotency or idempotency_guard
+        self.breaker = breaker or CircuitBreaker("clio_grow")
+        self._client: Optional[httpx.AsyncClient] = None
+        # Caps Grow requests in flight across every request on this worker
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client, created lazily on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared client and release pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    def build_payload(self, bot_data: BotDataInput) -> Dict[str, Any]:
+        """Build the Clio Grow inbox lead request body."""
+        return {
+            "inbox_lead": to_clio_payload(bot_data),
+            "inbox_lead_token": self.inbox_token,
+        }
+
+    async def submit_lead(
+        self,
+        bot_data: BotDataInput,
+        timeout: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+        persist: bool = True,
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        Submit a single lead to Clio Grow, at most once per idempotency key.
+
+        ``idempotency_key`` is an already-resolved key (see
+        ``idempotency.resolve_key``); the lead's content hash is used when it
+        is omitted. ``persist=False`` skips recording the lead in
+        ``intake_leads``, for callers that already own a row.
+
+        Returns:
+            Tuple of (response_data, status_code). Transport failures are
+            reported as 504 (timeout) or 502 (connection error) instead of
+            raising, so batch callers can keep going.
+
+        Raises:
+            CircuitOpenError: If Clio Grow's circuit breaker is open; the
+                caller should queue the lead instead
+        """
+        key = idempotency_key or resolve_key(bot_data)
+        return await self.idempotency.submit(
+            key, bot_data, lambda: self._post_lead(bot_data, timeout), persist
+        )
+
+    async def _post_lead(
+        self, bot_data: BotDataInput, timeout: Optional[float] = None
+    ) -> Tuple[Dict[str, Any], int]:
+        """POST one lead to the Grow inbox endpoint."""
+        with time_stage("normalize"):
+            payload = self.build_payload(bot_data)
+
+        try:
+            permit = self.breaker.acquire()
+        except CircuitOpenError:
+            SUBMISSIONS.inc("circuit_open")
+            raise
+
+        # 5xx, 429 and transport errors count against Grow's health; other
+        # 4xx are problems with the lead itself
+        healthy, started = False, None
+        try:
+            async with self._in_flight:
+                started = time.monotonic()
+                with time_stage("clio_request"):
+                    response = await self.client.post(
+                        self.inbox_url, json=payload, timeout=timeout or self.timeout
+                    )
+            healthy = response.status_code < 500 and response.status_code != 429
+        except httpx.TimeoutException as e:
+            SUBMISSIONS.inc("timeout")
+            logger.error(
+                "Clio Grow submission timed out",
+                extra={"error": str(e), "source": bot_data.source},
+            )
+            return {"error": f"Clio Grow request timed out: {e}"}, 504
+        except httpx.HTTPError as e:
+            SUBMISSIONS.inc("error")
+            logger.error(
+                "Clio Grow submission failed",
+                extra={"error": str(e), "error_type": type(e).__name__},
+            )
+            return {"error": f"Clio Grow request failed: {e}"}, 502
+        finally:
+            elapsed = time.monotonic() - started if started is not None else 0.0
+            self.breaker.record(permit, healthy, elapsed)
+
+        try:
+            response_data = response.json()
+        except ValueError:
+            response_data = {"raw_response": response.text}
+
+        if response.status_code == 201:
+            SUBMISSIONS.inc("created")
+        else:
+            SUBMISSIONS.inc("rejected")
+            logger.warning(
+                "Clio Grow rejected lead",
+                extra={"status_code": response.status_code, "source": bot_data.source},
+            )
+
+        return response_data, response.status_code
+
+    async def fan_out(
+        self,
+        items: List[T],
+        worker: Callable[[T], Awaitable[R]],
+        limit: Optional[int] = None,
+    ) -> List[R]:
+        """
+        Run ``worker`` over ``items`` concurrently, at most ``limit`` at a time.
+
+        Results are returned in the same order as ``items``. ``worker`` is
+        expected to handle its own errors; an exception aborts the fan-out,
+        cancelling the remaining items and waiting for them to finish before
+        it is re-raised.
+        """
+        semaphore = asyncio.Semaphore(limit or self.max_concurrency)
+
+        async def run(item: T) -> R:
+            async with semaphore:
+                return await worker(item)
+
+        tasks = [asyncio.ensure_future(run(item)) for item in items]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def fan_out_stream(
+        self,
+        items: AsyncIterable[T],
+        worker: Callable[[T], Awaitable[R]],
+        limit: Optional[int] = None,
+    ) -> List[R]:
+        """
+        Like ``fan_out``, but pulls items from an async iterator.
+
+        Work on each item starts as soon as it arrives. Once ``limit`` items
+        are in flight the iterator is not advanced, which applies
+        backpressure to whatever is producing it (e.g. a request body).
+        """
+        semaphore = asyncio.Semaphore(limit or self.max_concurrency)
+        tasks: List[asyncio.Task] = []
+
+        async def run(item: T) -> R:
+            try:
+                return await worker(item)
+            finally:
+                semaphore.release()
+
+        try:
+            async for item in items:
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(run(item)))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return list(await asyncio.gather(*tasks))
+
+    async def submit_batch(
+        self,
+        leads: List[BotDataInput],
+        timeout: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+        on_circuit_open: Optional[CircuitOpenHandler] = None,
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        Submit several leads and summarise them in the batch response format.
+
+        With ``on_circuit_open``, a lead rejected by an open circuit is
+        handed to it as ``(lead, index)`` (e.g. to queue it) and its result
+        stands in for the Grow response; the other leads still run to
+        completion, so only leads Clio Grow never received are handed over.
+        Without it the first rejection aborts the batch.
+
+        Returns:
+            Tuple of ({"total_leads", "successful", "failed", "results"},
+            status_code) where status_code is 201 if every lead was created
+            and 207 otherwise.
+        """
+
+        async def submit(item: Tuple[int, BotDataInput]) -> Tuple[Dict[str, Any], int]:
+            index, lead = item
+            try:
+                return await self.submit_lead(
+                    lead, timeout, resolve_key(lead, idempotency_key, index)
+                )
+            except CircuitOpenError:
+                if on_circuit_open is None:
+                    raise
+                return await on_circuit_open(lead, index), 202
+
+        outcomes = await self.fan_out(list(enumerate(leads)), submit)
+        results = [response_data for response_data, _ in outcomes]
+        successful = sum(1 for _, status_code in outcomes if status_code == 201)
+
+        summary = {
+            "total_leads": len(leads),
+            "successful": successful,
+            "failed": len(leads) - successful,
+            "results": results,
+        }
+        return summary, 201 if successful == len(leads) else 207
+
+    async def submit_any_payload(
+        self,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+        on_circuit_open: Optional[CircuitOpenHandler] = None,
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        Parse a payload of any supported format and submit it to Clio Grow.
+
+        Async counterpart of ``create_clio_lead_from_any_payload``.
+        ``idempotency_key`` is the raw ``Idempotency-Key`` header, if any.
+        ``on_circuit_open`` applies to multi-lead payloads (see
+        ``submit_batch``); a single lead still raises ``CircuitOpenError``.
+        """
+        parsed = parse_incoming_payload(payload)
+
+        if isinstance(parsed, list):
+            return await self.submit_batch(
+                parsed, timeout, idempotency_key, on_circuit_open
+            )
+        return await self.submit_lead(
+            parsed, timeout, resolve_key(parsed, idempotency_key)
+        )
+
+
+# Shared engine instance used by the intake proxies
+grow_engine = GrowSubmissionEngine()
@@ -0,0 +1,268 @@
+"""
+Conditional-GET cache for outbound API calls.
+
+``CachingTransport`` wraps an httpx transport. Successful GET responses that
+carry a validator (``ETag`` or ``Last-Modified``) are stored, body and
+headers, in a SQLite file. The next GET for the same URL sends
+``If-None-Match``/``If-Modified-Since``. On ``304 Not Modified`` the stored
+response is returned with the 304's fresh headers (rate-limit counters,
+dates) merged in, so an unchanged record costs a header round-trip instead
+of a full payload. Every read is revalidated, so nothing is served stale.
+
+Entries are keyed on the URL and the request headers that change what the
+server returns (credentials, API version, ``Accept``), so responses are never
+shared across tokens. Bodies are stored as received, still compressed if
+they were. They include client records, so the cache file is created
+readable and writable by its owner only (0600).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import httpx
+
+from clio_manage import config
+from clio_manage.utils.metrics import registry
+
+# Request headers that select a different representation
+VARY_HEADERS = ("authorization", "x-api-version", "accept", "accept-encoding")
+
+# Not stored with a response, and not copied over from a 304
+_HOP_BY_HOP = frozenset({"connection", "keep-alive", "transfer-encoding"})
+_BODY_HEADERS = frozenset({"content-length", "content-encoding", "content-type"})
+
+# Delete least recently used entries beyond max_entries every this many puts
+PRUNE_EVERY = 100
+
+CACHE_REQUESTS = registry.counter(
+    "http_cache_requests_total",
+    "Cacheable GETs by transport and result (hit: 304 served from cache, "
+    "changed: stored entry outdated, miss: no usable entry)",
+    ("transport", "result"),
+)
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class SQLiteResponseCache:
+    """Cached responses in a SQLite file shared by every worker on the host."""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10000,
+        max_body_bytes: int = 5 * 1024 * 1024,
+        busy_timeout: float = 5.0,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_body_bytes = max_body_bytes
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._puts = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        db = self._connection()
+        row = db.execute(
+            "SELECT status_code, headers, body, etag, last_modified"
+            " FROM clio_http_cache WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        db.execute(
+            "UPDATE clio_http_cache SET used_at = ? WHERE key = ?", (time.time(), key)
+        )
+        status_code, headers, body, etag, last_modified = row
+        return CachedResponse(
+            status_code,
+            [tuple(h) for h in json.loads(headers)],
+            body,
+            etag,
+            last_modified,
+        )
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        if len(response.body) > self.max_body_bytes:
+            return
+        db = self._connection()
+        db.execute(
+            "INSERT OR REPLACE INTO clio_http_cache"
+            " (key, status_code, headers, body, etag, last_modified, used_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                response.status_code,
+                json.dumps(response.headers),
+                response.body,
+                response.etag,
+                response.last_modified,
+                time.time(),
+            ),
+        )
+        self._puts += 1
+        if self._puts % PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self) -> None:
+        """Drop the least recently used entries beyond ``max_entries``."""
+        self._connection().execute(
+            "DELETE FROM clio_http_cache WHERE key IN ("
+            " SELECT key FROM clio_http_cache ORDER BY used_at DESC"
+            " LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM clio_http_cache")
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread (calls run in the default executor)."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            _restrict_permissions(self.path)
+            db = sqlite3.connect(
+                self.path, timeout=self.busy_timeout, isolation_level=None
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS clio_http_cache ("
+                " key TEXT PRIMARY KEY,"
+                " status_code INTEGER NOT NULL,"
+                " headers TEXT NOT NULL,"
+                " body BLOB NOT NULL,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " used_at REAL NOT NULL)"
+            )
+            self._local.db = db
+        return db
+
+
+def _restrict_permissions(path: str) -> None:
+    """Create ``path`` if needed and make it private to the owner."""
+    if path == ":memory:":
+        return
+    os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+    # SQLite gives the -wal/-shm files the database file's permissions
+    os.chmod(path, 0o600)
+
+
+def cache_key(request: httpx.Request) -> str:
+    parts = [request.method, str(request.url)]
+    parts += [f"{name}:{request.headers.get(name, '')}" for name in VARY_HEADERS]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _cacheable(response: httpx.Response) -> bool:
+    if response.status_code != 200:
+        return False
+    if "no-store" in response.headers.get("Cache-Control", "").lower():
+        return False
+    return "ETag" in response.headers or "Last-Modified" in response.headers
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """httpx transport adding conditional GETs backed by a response cache."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        cache: SQLiteResponseCache,
+        name: str = "",
+    ):
+        self.transport = transport
+        self.cache = cache
+        self.name = name
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # Callers sending their own validators handle 304s themselves
+        if request.method != "GET" or (
+            "If-None-Match" in request.headers or "If-Modified-Since" in request.headers
+        ):
+            return await self.transport.handle_async_request(request)
+
+        key = cache_key(request)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            if cached.etag:
+                request.headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request.headers["If-Modified-Since"] = cached.last_modified
+
+        response = await self.transport.handle_async_request(request)
+
+        if cached is not None and response.status_code == 304:
+            await response.aclose()
+            CACHE_REQUESTS.inc(self.name, "hit")
+            headers = httpx.Headers(cached.headers)
+            for name, value in response.headers.items():
+                if name not in _HOP_BY_HOP and name not in _BODY_HEADERS:
+                    headers[name] = value
+            return httpx.Response(
+                cached.status_code,
+                headers=headers,
+                stream=httpx.ByteStream(cached.body),
+                extensions=response.extensions,
+            )
+
+        changed = cached is not None and response.status_code == 200
+        CACHE_REQUESTS.inc(self.name, "changed" if changed else "miss")
+        if not _cacheable(response):
+            return response
+
+        # Raw bytes as sent (possibly compressed); the client decodes them
+        try:
+            body = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name not in _HOP_BY_HOP
+        ]
+        await asyncio.to_thread(
+            self.cache.put,
+            key,
+            CachedResponse(
+                response.status_code,
+                headers,
+                body,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            ),
+        )
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            stream=httpx.ByteStream(body),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def create_response_cache(url: str) -> Optional[SQLiteResponseCache]:
+    """Cache for ``url`` ("sqlite:///path/to/file.db"), or None if ``url`` is empty."""
+    if not url:
+        return None
+    if url.startswith("sqlite:///"):
+        return SQLiteResponseCache(
+            url[len("sqlite:///") :], max_entries=config.CLIO_HTTP_CACHE_MAX_ENTRIES
+        )
+    raise ValueError(f"Unsupported HTTP cache URL: {url}")
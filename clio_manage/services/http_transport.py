@@ -0,0 +1,188 @@
+"""
+Shared, pooled HTTP clients for outbound API calls.
+
+``clio_transport`` owns one ``httpx.AsyncClient`` for every Clio API call
+(ClioAPIHelper, the Clio services, TriageService, ``clio_get``). Connections
+stay pooled and kept alive, and with HTTP/2 they are multiplexed, so requests
+stop paying TCP and TLS setup each time. Apps close it from their lifespan.
+Its GETs go through the conditional-GET cache in ``http_cache``.
+
+A client is bound to the event loop that created it. Code that runs each
+call under its own ``asyncio.run`` (Celery tasks) gets a fresh client per
+loop instead of a broken one.
+"""
+
+import asyncio
+import weakref
+from typing import Dict, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+from clio_manage import config
+from clio_manage.services.http_cache import (
+    CachingTransport,
+    SQLiteResponseCache,
+    create_response_cache,
+)
+from clio_manage.utils.metrics import registry
+
+_transports: "weakref.WeakSet[PooledTransport]" = weakref.WeakSet()
+
+
+def _collect_connections() -> Dict[Tuple[str, ...], float]:
+    values: Dict[Tuple[str, ...], float] = {}
+    for transport in list(_transports):
+        stats = transport.pool_stats()
+        for state in ("active", "idle"):
+            values[(transport.name, state)] = stats[f"{state}_connections"]
+    return values
+
+
+POOL_CONNECTIONS = registry.gauge(
+    "http_pool_connections",
+    "Pooled outbound connections by transport and state",
+    ("transport", "state"),
+    collect=_collect_connections,
+)
+REQUESTS = registry.counter(
+    "http_pool_requests_total",
+    "Outbound requests sent through a pooled transport",
+    ("transport",),
+)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class PooledTransport:
+    """Lazily created, connection-pooled ``httpx.AsyncClient`` with stats."""
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str = "",
+        http2: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        cache: Optional[SQLiteResponseCache] = None,
+    ):
+        self.name = name
+        self.cache = cache
+        self.base_url = base_url
+        self.http2 = config.CLIO_HTTP2 if http2 is None else http2
+        if self.http2 and not _http2_available():
+            logger.warning(
+                f"{name}: HTTP/2 requested but h2 is not installed; using HTTP/1.1"
+            )
+            self.http2 = False
+        self.timeout = timeout or config.CLIO_HTTP_TIMEOUT_SECONDS
+        self.connect_timeout = (
+            connect_timeout or config.CLIO_HTTP_CONNECT_TIMEOUT_SECONDS
+        )
+        self.max_connections = max_connections or config.CLIO_HTTP_MAX_CONNECTIONS
+        self.max_keepalive = max_keepalive or config.CLIO_HTTP_MAX_KEEPALIVE
+        self.keepalive_expiry = (
+            keepalive_expiry or config.CLIO_HTTP_KEEPALIVE_EXPIRY_SECONDS
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._pool_transport: Optional[httpx.AsyncHTTPTransport] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.clients_created = 0
+        _transports.add(self)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client for the running event loop, created on first use."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            # A client left behind by a finished loop cannot be closed from
+            # here; its sockets went with that loop
+            self._pool_transport = httpx.AsyncHTTPTransport(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+            transport: httpx.AsyncBaseTransport = self._pool_transport
+            if self.cache is not None:
+                transport = CachingTransport(transport, self.cache, self.name)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                transport=transport,
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                event_hooks={"request": [self._count_request]},
+            )
+            self._loop = loop
+            self.clients_created += 1
+        return self._client
+
+    async def _count_request(self, request: httpx.Request) -> None:
+        REQUESTS.inc(self.name)
+
+    async def aclose(self) -> None:
+        """Close the client and its pooled connections (call on shutdown)."""
+        client, loop = self._client, self._loop
+        # A client from another, finished loop has nothing left to close
+        if (
+            client is not None
+            and not client.is_closed
+            and loop is asyncio.get_running_loop()
+        ):
+            await client.aclose()
+        self._client = None
+        self._pool_transport = None
+        self._loop = None
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Connection pool occupancy, for monitoring."""
+        stats = {
+            "connections": 0,
+            "active_connections": 0,
+            "idle_connections": 0,
+            "http2_connections": 0,
+            "max_connections": self.max_connections,
+            "requests": int(REQUESTS.value(self.name)),
+            "clients_created": self.clients_created,
+        }
+        if (
+            self._client is None
+            or self._client.is_closed
+            or (self._loop is not None and self._loop.is_closed())
+        ):
+            return stats
+        # httpx does not expose its pool; read httpcore's connection list
+        pool = getattr(self._pool_transport, "_pool", None)
+        for connection in getattr(pool, "connections", ()):
+            if connection.is_closed():
+                continue
+            stats["connections"] += 1
+            if connection.is_idle():
+                stats["idle_connections"] += 1
+            else:
+                stats["active_connections"] += 1
+            if "HTTP/2" in connection.info():
+                stats["http2_connections"] += 1
+        return stats
+
+
+# Every Clio API call goes through this client; GETs revalidate against the
+# CLIO_HTTP_CACHE response cache
+clio_transport = PooledTransport(
+    "clio_api",
+    base_url=config.CLIO_API_BASE,
+    cache=create_response_cache(config.CLIO_HTTP_CACHE),
+)
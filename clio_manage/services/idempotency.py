@@ -0,0 +1,229 @@
+"""
+Idempotency layer for Clio Grow submissions.
+
+Retried webhooks are matched either on the caller's ``Idempotency-Key``
+header or on a content hash of the normalized lead. Successful results are
+kept in an in-memory TTL/LRU cache and in ``intake_leads.idempotency_key``
+so a repeat submission returns the original result without calling Clio.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.schemas import BotDataInput
+from loguru import logger
+from sqlalchemy import select
+
+from clio_manage import config
+from clio_manage.db import SessionLocal
+from clio_manage.models import (
+    LEAD_STATUS_PENDING,
+    LEAD_STATUS_SENT,
+    LEAD_STATUS_SUBMITTING,
+    IntakeLead,
+)
+from clio_manage.services.intake_writer import IntakeWriter, intake_writer
+from clio_manage.utils.intake_logging import intake_log
+from clio_manage.utils.metrics import SUBMISSIONS, time_stage
+
+SubmitResult = Tuple[Dict[str, Any], int]
+
+# Rows that already stand for a lead; failed rows are retried instead
+_LIVE_STATUSES = (LEAD_STATUS_SENT, LEAD_STATUS_PENDING, LEAD_STATUS_SUBMITTING)
+
+_WHITESPACE = re.compile(r"\s+")
+_NON_DIGITS = re.compile(r"\D")
+
+
+def _clean(value: Any) -> str:
+    if value is None:
+        return ""
+    return _WHITESPACE.sub(" ", str(value)).strip().casefold()
+
+
+def content_key(bot_data: BotDataInput) -> str:
+    """Hash the identifying lead fields into a stable idempotency key."""
+    parts = [
+        _clean(bot_data.first_name),
+        _clean(bot_data.last_name),
+        _clean(bot_data.email),
+        _NON_DIGITS.sub("", bot_data.phone_number or ""),
+        _clean(bot_data.message),
+        _clean(bot_data.source),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def header_key(idempotency_key: str, index: int = 0) -> str:
+    """Derive a per-lead key from a caller-supplied ``Idempotency-Key``."""
+    raw = f"header\x1f{idempotency_key}\x1f{index}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def resolve_key(
+    bot_data: BotDataInput, idempotency_key: Optional[str] = None, index: int = 0
+) -> str:
+    """Use the header key when the caller sent one, else the content hash."""
+    if idempotency_key:
+        return header_key(idempotency_key, index)
+    return content_key(bot_data)
+
+
+class IdempotencyGuard:
+    """Deduplicates lead submissions in memory and against ``intake_leads``."""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        session_factory=SessionLocal,
+        writer: Optional[IntakeWriter] = None,
+    ):
+        self.ttl_seconds = ttl_seconds or config.IDEMPOTENCY_TTL_SECONDS
+        self.max_entries = max_entries or config.IDEMPOTENCY_CACHE_SIZE
+        self.session_factory = session_factory
+        self.writer = writer or intake_writer
+        self._cache: "OrderedDict[str, Tuple[float, SubmitResult]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def submit(
+        self,
+        key: str,
+        bot_data: BotDataInput,
+        send: Callable[[], Awaitable[SubmitResult]],
+        persist: bool = True,
+    ) -> SubmitResult:
+        """
+        Return the stored result for ``key`` or call ``send`` exactly once.
+
+        Concurrent duplicates wait for the first submission instead of
+        racing it to Clio. Only successful (201) results are remembered, so
+        a retry after a failure still reaches Clio.
+        """
+        cached = self._cache_get(key)
+        if cached is not None:
+            SUBMISSIONS.inc("duplicate")
+            intake_log.info(
+                "idempotency.hit", "Duplicate lead served from idempotency cache"
+            )
+            return cached
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            result = await asyncio.shield(pending)
+            if result is not None:
+                return result
+            return await self.submit(key, bot_data, send, persist)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        result: Optional[SubmitResult] = None
+        try:
+            result = await asyncio.to_thread(self._load_stored, key)
+            if result is not None:
+                SUBMISSIONS.inc("duplicate")
+                intake_log.info(
+                    "idempotency.hit", "Duplicate lead served from intake_leads"
+                )
+            else:
+                result = await send()
+                if persist and result[1] == 201:
+                    try:
+                        await self._persist(key, bot_data, result)
+                    except Exception as e:
+                        # Clio already has the lead; the in-memory cache
+                        # below still stops this worker resubmitting it
+                        logger.error(
+                            "Failed to record submitted lead",
+                            extra={"error": str(e), "idempotency_key": key},
+                        )
+            if result[1] == 201:
+                self._cache_put(key, result)
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+            future.set_result(result)
+
+    def find_lead_id(self, db, key: str) -> Optional[int]:
+        """
+        Return the id of a recent live ``intake_leads`` row with this key.
+
+        Only sent, pending and submitting rows count; a failed submission
+        must not swallow the retry that could still get the lead through.
+        """
+        return db.execute(
+            select(IntakeLead.id)
+            .where(
+                IntakeLead.idempotency_key == key,
+                IntakeLead.clio_status.in_(_LIVE_STATUSES),
+                IntakeLead.created_at >= self._cutoff(),
+            )
+            .order_by(IntakeLead.id.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+
+    def _cutoff(self) -> datetime:
+        return datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+
+    def _cache_get(self, key: str) -> Optional[SubmitResult]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, key: str, result: SubmitResult) -> None:
+        self._cache[key] = (time.monotonic() + self.ttl_seconds, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _load_stored(self, key: str) -> Optional[SubmitResult]:
+        """Look up a previously successful submission in ``intake_leads``."""
+        with time_stage("db_lookup"), self.session_factory() as db:
+            lead = db.execute(
+                select(IntakeLead)
+                .where(
+                    IntakeLead.idempotency_key == key,
+                    IntakeLead.clio_status == LEAD_STATUS_SENT,
+                    IntakeLead.created_at >= self._cutoff(),
+                )
+                .order_by(IntakeLead.id.desc())
+                .limit(1)
+            ).scalar_one_or_none()
+            if lead is None or not lead.clio_response:
+                return None
+            try:
+                stored = json.loads(lead.clio_response)
+                return stored["body"], stored["status_code"]
+            except (ValueError, KeyError, TypeError):
+                return None
+
+    async def _persist(
+        self, key: str, bot_data: BotDataInput, result: SubmitResult
+    ) -> None:
+        """Record a successful submission so other workers see it."""
+        from clio_manage.services.grow_submission import extract_lead_id
+
+        response_data, status_code = result
+        lead = IntakeLead.from_bot_data(bot_data.model_dump(), idempotency_key=key)
+        lead.mark_sent_to_clio(
+            extract_lead_id(response_data),
+            LEAD_STATUS_SENT,
+            json.dumps({"status_code": status_code, "body": response_data}),
+        )
+        await self.writer.insert(lead)
+
+
+# Shared guard used by the Grow submission engine
+idempotency_guard = IdempotencyGuard()
@@ -0,0 +1,330 @@
+"""
+Durable accept-then-process intake queue backed by the ``intake_leads`` table.
+
+Webhooks persist normalized leads as ``pending`` rows and return immediately;
+a pool of background workers claims pending rows and submits them to Clio
+Grow, recording the outcome with ``IntakeLead.mark_sent_to_clio``.
+While Clio Grow's circuit breaker is open the webhooks spill leads here and
+the workers hold off, then drain the backlog once probes succeed.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.schemas import BotDataInput
+from loguru import logger
+from sqlalchemy import or_, select, update
+
+from clio_manage import config
+from clio_manage.db import SessionLocal, init_db
+from clio_manage.models import (
+    LEAD_STATUS_FAILED,
+    LEAD_STATUS_PENDING,
+    LEAD_STATUS_SENT,
+    LEAD_STATUS_SUBMITTING,
+    IntakeLead,
+)
+from clio_manage.payload_parser import parse_incoming_payload
+from clio_manage.services.circuit_breaker import CircuitOpenError
+from clio_manage.services.grow_submission import (
+    GrowSubmissionEngine,
+    extract_lead_id,
+    grow_engine,
+)
+from clio_manage.services.idempotency import resolve_key
+from clio_manage.services.intake_writer import IntakeWriter, intake_writer
+from clio_manage.utils.metrics import time_stage
+
+# (lead id, bot_data, idempotency key) of a row moved to ``submitting``
+Claimed = Tuple[int, Dict[str, Any], Optional[str]]
+
+
+class IntakeQueue:
+    """Persists intake leads and drains them to Clio Grow in the background."""
+
+    def __init__(
+        self,
+        engine: Optional[GrowSubmissionEngine] = None,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        session_factory=SessionLocal,
+        writer: Optional[IntakeWriter] = None,
+        lease_seconds: Optional[float] = None,
+    ):
+        self.engine = engine or grow_engine
+        self.writer = writer or intake_writer
+        self.workers = workers or config.INTAKE_QUEUE_WORKERS
+        self.batch_size = batch_size or config.INTAKE_QUEUE_BATCH_SIZE
+        self.poll_interval = poll_interval or config.INTAKE_QUEUE_POLL_SECONDS
+        self.lease_seconds = lease_seconds or config.INTAKE_QUEUE_LEASE_SECONDS
+        self.session_factory = session_factory
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Create tables, recover abandoned rows and start the worker pool."""
+        if self._tasks:
+            return
+        await asyncio.to_thread(self._prepare)
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(worker_id))
+            for worker_id in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._sweeper()))
+        logger.info("Intake queue started", extra={"workers": self.workers})
+
+    async def stop(self) -> None:
+        """
+        Cancel the worker pool.
+
+        Unfinished rows stay ``submitting`` until their lease expires, then
+        the expired-claim sweep of any running process puts them back to
+        pending.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Intake queue stopped")
+
+    async def enqueue(
+        self,
+        leads: List[BotDataInput],
+        idempotency_key: Optional[str] = None,
+        first_index: int = 0,
+    ) -> List[int]:
+        """
+        Persist leads as pending rows and wake the workers.
+
+        A lead whose idempotency key already has a recent row is not queued
+        again; the existing row's id is returned in its place.
+        ``first_index`` is the position of ``leads[0]`` in its envelope,
+        used to derive per-lead keys when leads are enqueued one at a time.
+        """
+        guard = self.engine.idempotency
+        inserts = []
+        for index, lead in enumerate(leads, start=first_index):
+            key = resolve_key(lead, idempotency_key, index)
+            row = IntakeLead.from_bot_data(
+                lead.model_dump(),
+                clio_status=LEAD_STATUS_PENDING,
+                idempotency_key=key,
+            )
+            inserts.append(
+                self.writer.insert(row, lookup=partial(guard.find_lead_id, key=key))
+            )
+        lead_ids = list(await asyncio.gather(*inserts))
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return lead_ids
+
+    async def enqueue_payload(
+        self, payload: Dict[str, Any], idempotency_key: Optional[str] = None
+    ) -> List[int]:
+        """Parse a payload of any supported format and enqueue its leads."""
+        parsed = parse_incoming_payload(payload)
+        leads = parsed if isinstance(parsed, list) else [parsed]
+        return await self.enqueue(leads, idempotency_key)
+
+    async def get_status(self, lead_id: int) -> Optional[Dict[str, Any]]:
+        """Return the submission state of a queued lead, or None if unknown."""
+        return await asyncio.to_thread(self._load_status, lead_id)
+
+    async def _worker(self, worker_id: int) -> None:
+        """Claim and submit pending rows until cancelled."""
+        while True:
+            try:
+                # Leave the backlog alone while Clio Grow's circuit is open
+                retry_after = self.engine.breaker.retry_after()
+                if retry_after:
+                    await asyncio.sleep(min(retry_after, self.poll_interval))
+                    continue
+
+                self._wakeup.clear()
+                # While half-open, claim single leads to use as probes
+                limit = 1 if self.engine.breaker.rejecting else self.batch_size
+                with time_stage("queue_claim"):
+                    claimed = await asyncio.to_thread(self._claim_batch, limit)
+                if not claimed:
+                    try:
+                        await asyncio.wait_for(
+                            self._wakeup.wait(), timeout=self.poll_interval
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self.engine.fan_out(claimed, self.submit_claimed)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    "Intake queue worker error",
+                    extra={"worker_id": worker_id, "error": str(e)},
+                )
+                await asyncio.sleep(self.poll_interval)
+
+    async def _sweeper(self) -> None:
+        """
+        Requeue expired claims every ``lease_seconds`` until cancelled.
+
+        Rows claimed by a process that crashed would otherwise stay
+        ``submitting`` until some process restarted.
+        """
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            try:
+                requeued = await asyncio.to_thread(self._requeue_expired)
+            except Exception as e:
+                logger.error("Intake queue sweep error", extra={"error": str(e)})
+                continue
+            if requeued and self._wakeup is not None:
+                self._wakeup.set()
+
+    async def submit_claimed(self, claimed: Claimed) -> Tuple[str, Optional[int]]:
+        """
+        Submit one claimed row and record the outcome.
+
+        Returns:
+            Tuple of (new clio_status, Grow status code or None if the row
+            was put back to pending because the circuit is open)
+        """
+        lead_id, bot_data, key = claimed
+        try:
+            response_data, status_code = await self.engine.submit_lead(
+                BotDataInput(**bot_data), idempotency_key=key, persist=False
+            )
+        except CircuitOpenError:
+            await self.writer.requeue(lead_id)
+            return LEAD_STATUS_PENDING, None
+        except Exception as e:
+            response_data, status_code = {"error": str(e)}, 500
+
+        status = LEAD_STATUS_SENT if status_code == 201 else LEAD_STATUS_FAILED
+        await self.writer.mark_sent(
+            lead_id,
+            extract_lead_id(response_data),
+            status,
+            json.dumps({"status_code": status_code, "body": response_data}),
+        )
+        return status, status_code
+
+    def _prepare(self) -> None:
+        """Ensure tables exist and requeue rows whose claim has expired."""
+        init_db()
+        self._requeue_expired()
+
+    def _requeue_expired(self) -> int:
+        """
+        Put ``submitting`` rows whose claim has expired back to pending.
+
+        Rows claimed by other live workers sharing the database are left
+        alone; only claims older than ``lease_seconds`` (or made before
+        claims were timestamped) are taken as abandoned by a dead process.
+        Returns the number of rows requeued.
+        """
+        stale_before = datetime.utcnow() - timedelta(seconds=self.lease_seconds)
+        with self.session_factory() as db:
+            result = db.execute(
+                update(IntakeLead)
+                .where(
+                    IntakeLead.clio_status == LEAD_STATUS_SUBMITTING,
+                    or_(
+                        IntakeLead.claimed_at.is_(None),
+                        IntakeLead.claimed_at < stale_before,
+                    ),
+                )
+                .values(clio_status=LEAD_STATUS_PENDING, claimed_at=None)
+            )
+            db.commit()
+        if result.rowcount:
+            logger.warning(
+                "Requeued intake leads with expired claims",
+                extra={"count": result.rowcount},
+            )
+        return result.rowcount
+
+    def _claim_batch(self, limit: int) -> List[Claimed]:
+        """Atomically move up to ``limit`` pending rows to ``submitting``."""
+        return self.claim([IntakeLead.clio_status == LEAD_STATUS_PENDING], limit)
+
+    def claim(
+        self, conditions: Sequence[Any], limit: Optional[int] = None
+    ) -> List[Claimed]:
+        """
+        Move rows matching ``conditions`` to ``submitting`` and return them.
+
+        The conditional UPDATE makes the claim safe across uvicorn workers
+        sharing the same database file: a row is only claimed if it still
+        matches ``conditions`` at update time. ``claimed_at`` records the
+        start of the claim's lease.
+        """
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            candidates = (
+                db.execute(
+                    select(IntakeLead)
+                    .where(*conditions)
+                    .order_by(IntakeLead.id)
+                    .limit(limit)
+                )
+                .scalars()
+                .all()
+            )
+            claimed = []
+            for lead in candidates:
+                result = db.execute(
+                    update(IntakeLead)
+                    .where(IntakeLead.id == lead.id, *conditions)
+                    .values(clio_status=LEAD_STATUS_SUBMITTING, claimed_at=now)
+                )
+                if result.rowcount == 1:
+                    claimed.append((lead.id, lead.to_bot_data(), lead.idempotency_key))
+            db.commit()
+            return claimed
+
+    def release(self, lead_ids: Sequence[int]) -> None:
+        """Hand claimed rows that will not be submitted here back to the queue."""
+        with self.session_factory() as db:
+            db.execute(
+                update(IntakeLead)
+                .where(
+                    IntakeLead.id.in_(lead_ids),
+                    IntakeLead.clio_status == LEAD_STATUS_SUBMITTING,
+                )
+                .values(clio_status=LEAD_STATUS_PENDING, claimed_at=None)
+            )
+            db.commit()
+
+    def _load_status(self, lead_id: int) -> Optional[Dict[str, Any]]:
+        with self.session_factory() as db:
+            lead = db.get(IntakeLead, lead_id)
+            if lead is None:
+                return None
+            return {
+                "lead_id": lead.id,
+                "status": lead.clio_status,
+                "clio_lead_id": lead.clio_lead_id,
+                "clio_sent_at": (
+                    lead.clio_sent_at.isoformat() if lead.clio_sent_at else None
+                ),
+                "clio_response": _decode_response(lead.clio_response),
+            }
+
+
+def _decode_response(raw: Optional[str]) -> Any:
+    """Stored responses are JSON, but rows written elsewhere may be plain text."""
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+# Shared queue instance used by the intake proxies
+intake_queue = IntakeQueue()
@@ -0,0 +1,209 @@
+"""
+Bulk replay of ``intake_leads`` rows that failed or were never sent to Clio.
+
+Matching rows are claimed (moved to ``submitting``) so queue workers leave
+them alone, resubmitted concurrently through the Grow engine within a shared
+per-minute budget, and written back through the group-commit writer. Progress
+is reported as a stream of events.
+
+Usage:
+    python -m clio_manage.services.intake_replay --since 2025-07-01 --source "Capture Now Agent"
+"""
+
+import argparse
+import asyncio
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from loguru import logger
+from sqlalchemy import func, or_, select
+
+from clio_manage import config
+from clio_manage.models import LEAD_STATUS_FAILED, IntakeLead
+from clio_manage.services.intake_queue import Claimed, IntakeQueue, intake_queue
+from clio_manage.utils.clio_api_helpers import ClioRateLimiter
+
+# "unsent" selects rows whose clio_status was never set
+REPLAY_STATUSES = ("failed", "unsent")
+
+
+@dataclass
+class ReplayFilter:
+    """Which ``intake_leads`` rows to replay."""
+
+    statuses: Sequence[str] = REPLAY_STATUSES
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    source: Optional[str] = None
+    limit: Optional[int] = None
+
+    def conditions(self) -> List[Any]:
+        unknown = set(self.statuses) - set(REPLAY_STATUSES)
+        if unknown:
+            raise ValueError(f"Cannot replay statuses {sorted(unknown)}")
+        status_conditions = []
+        if "failed" in self.statuses:
+            status_conditions.append(IntakeLead.clio_status == LEAD_STATUS_FAILED)
+        if "unsent" in self.statuses:
+            status_conditions.append(IntakeLead.clio_status.is_(None))
+
+        conditions = [or_(*status_conditions)]
+        if self.since is not None:
+            conditions.append(IntakeLead.created_at >= self.since)
+        if self.until is not None:
+            conditions.append(IntakeLead.created_at < self.until)
+        if self.source is not None:
+            conditions.append(IntakeLead.source == self.source)
+        return conditions
+
+
+@dataclass
+class ReplayProgress:
+    """Running totals of a replay."""
+
+    total: int = 0
+    outcomes: Counter = field(default_factory=Counter)
+
+    @property
+    def done(self) -> int:
+        return sum(self.outcomes.values())
+
+
+class IntakeReplayer:
+    """Re-drives failed or unsent intake leads to Clio Grow."""
+
+    def __init__(
+        self,
+        queue: Optional[IntakeQueue] = None,
+        concurrency: Optional[int] = None,
+        max_per_minute: Optional[int] = None,
+    ):
+        self.queue = queue or intake_queue
+        self.concurrency = concurrency or config.INTAKE_REPLAY_CONCURRENCY
+        # Drawn from the shared rate-limit store, so concurrent replays on
+        # other workers spend the same budget
+        self.rate_limiter = ClioRateLimiter(
+            max_per_minute or config.INTAKE_REPLAY_MAX_PER_MINUTE,
+            60,
+            budget_key="clio_grow_replay",
+        )
+
+    async def count(self, filters: ReplayFilter) -> int:
+        """Number of rows ``replay`` would pick up right now."""
+        return await asyncio.to_thread(self._count, filters)
+
+    async def replay(self, filters: ReplayFilter) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Replay matching leads, yielding progress events as they complete.
+
+        Events are ``{"event": "started", "total"}``, one ``{"event": "lead",
+        "lead_id", "status", "status_code"}`` per lead, then ``{"event":
+        "finished", "total", "outcomes"}``. If the consumer stops early, leads
+        not yet submitted are handed to the intake queue instead.
+        """
+        conditions = filters.conditions()
+        claimed = await asyncio.to_thread(self.queue.claim, conditions, filters.limit)
+        progress = ReplayProgress(total=len(claimed))
+        logger.info("Replaying intake leads", extra={"total": progress.total})
+        yield {"event": "started", "total": progress.total}
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        finished = set()
+
+        async def run(row: Claimed) -> Dict[str, Any]:
+            async with semaphore:
+                await self.rate_limiter.wait_if_needed()
+                status, status_code = await self.queue.submit_claimed(row)
+            finished.add(row[0])
+            return {
+                "event": "lead",
+                "lead_id": row[0],
+                "status": status,
+                "status_code": status_code,
+            }
+
+        tasks = [asyncio.create_task(run(row)) for row in claimed]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                event = await next_done
+                progress.outcomes[event["status"]] += 1
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+            unfinished = [row[0] for row in claimed if row[0] not in finished]
+            if unfinished:
+                await asyncio.gather(*tasks, return_exceptions=True)
+                await asyncio.to_thread(self.queue.release, unfinished)
+                logger.warning(
+                    "Replay stopped early; remaining leads handed to the queue",
+                    extra={"remaining": len(unfinished)},
+                )
+
+        logger.info(
+            "Replay finished",
+            extra={"total": progress.total, "outcomes": dict(progress.outcomes)},
+        )
+        yield {
+            "event": "finished",
+            "total": progress.total,
+            "outcomes": dict(progress.outcomes),
+        }
+
+    def _count(self, filters: ReplayFilter) -> int:
+        with self.queue.session_factory() as db:
+            total = db.execute(
+                select(func.count(IntakeLead.id)).where(*filters.conditions())
+            ).scalar_one()
+        return min(total, filters.limit) if filters.limit else total
+
+
+# Shared replayer used by the admin endpoint
+intake_replayer = IntakeReplayer()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from clio_manage.db import init_db
+    from clio_manage.services.intake_writer import intake_writer
+
+    init_db()
+    filters = ReplayFilter(
+        statuses=args.status or REPLAY_STATUSES,
+        since=args.since,
+        until=args.until,
+        source=args.source,
+        limit=args.limit,
+    )
+    replayer = IntakeReplayer(concurrency=args.concurrency)
+    if args.dry_run:
+        print(f"{await replayer.count(filters)} leads would be replayed")
+        return
+
+    try:
+        async for event in replayer.replay(filters):
+            print(json.dumps(event), flush=True)
+    finally:
+        await intake_writer.stop()
+        await replayer.queue.engine.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay failed or unsent intake leads to Clio Grow"
+    )
+    parser.add_argument(
+        "--status",
+        action="append",
+        choices=REPLAY_STATUSES,
+        help="Statuses to replay (repeatable; default: failed and unsent)",
+    )
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.fromisoformat)
+    parser.add_argument("--source")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(_main(parser.parse_args()))
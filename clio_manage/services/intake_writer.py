@@ -0,0 +1,180 @@
+"""
+Group-commit writer for ``intake_leads``.
+
+Inserts and status updates from concurrent requests are queued and applied
+in a single transaction every few milliseconds (or every ``batch_size``
+operations), so a burst of leads costs one SQLite commit instead of one per
+lead. Each caller awaits its own operation and only resumes once the batch
+containing it has been committed.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from clio_manage import config
+from clio_manage.db import SessionLocal
+from clio_manage.models import LEAD_STATUS_PENDING, IntakeLead
+from clio_manage.utils.metrics import time_stage
+
+# Optional lookup run inside the batch transaction; returning an id skips the insert
+ExistingLookup = Callable[[Session], Optional[int]]
+
+
+@dataclass
+class _WriteOp:
+    """A queued write and the future its caller is waiting on."""
+
+    kind: str
+    future: asyncio.Future
+    lead: Optional[IntakeLead] = None
+    lookup: Optional[ExistingLookup] = None
+    lead_id: Optional[int] = None
+    update: Tuple[Any, ...] = field(default_factory=tuple)
+
+
+class IntakeWriter:
+    """Batches ``intake_leads`` writes into group commits."""
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        session_factory=SessionLocal,
+    ):
+        self.batch_size = batch_size or config.INTAKE_WRITER_BATCH_SIZE
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else config.INTAKE_WRITER_FLUSH_MS / 1000
+        )
+        self.session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def insert(
+        self, lead: IntakeLead, lookup: Optional[ExistingLookup] = None
+    ) -> int:
+        """
+        Insert a transient ``IntakeLead`` and return its id once committed.
+
+        If ``lookup`` finds an existing row inside the batch transaction,
+        nothing is inserted and that row's id is returned instead.
+        """
+        return await self._submit(_WriteOp("insert", self._future(), lead, lookup))
+
+    async def mark_sent(
+        self,
+        lead_id: int,
+        clio_lead_id: Optional[int],
+        status: str,
+        response: str,
+    ) -> None:
+        """Apply ``IntakeLead.mark_sent_to_clio`` and wait for the commit."""
+        await self._submit(
+            _WriteOp(
+                "mark_sent",
+                self._future(),
+                lead_id=lead_id,
+                update=(clio_lead_id, status, response),
+            )
+        )
+
+    async def requeue(self, lead_id: int) -> None:
+        """Put a claimed lead back to ``pending`` and wait for the commit."""
+        await self._submit(_WriteOp("requeue", self._future(), lead_id=lead_id))
+
+    async def stop(self) -> None:
+        """Flush queued writes and stop the background flusher."""
+        if self._task is None:
+            return
+        if self._queue is not None:
+            await self._queue.join()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._queue = None
+
+    def _future(self) -> asyncio.Future:
+        return asyncio.get_running_loop().create_future()
+
+    async def _submit(self, op: _WriteOp) -> Any:
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        self._queue.put_nowait(op)
+        return await op.future
+
+    async def _run(self) -> None:
+        """Collect operations into batches and commit them off the event loop."""
+        while True:
+            batch: List[_WriteOp] = [await self._queue.get()]
+
+            # Give concurrent requests a moment to join this transaction
+            if self.flush_interval and self._queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.flush_interval)
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                with time_stage("db_commit"):
+                    outcomes = await asyncio.to_thread(self._commit, batch)
+            except Exception as e:
+                outcomes = [(False, e)] * len(batch)
+
+            for op, (ok, value) in zip(batch, outcomes):
+                if not op.future.done():
+                    if ok:
+                        op.future.set_result(value)
+                    else:
+                        op.future.set_exception(value)
+                self._queue.task_done()
+
+    def _commit(self, batch: List[_WriteOp]) -> List[Tuple[bool, Any]]:
+        """
+        Apply a batch in one transaction.
+
+        If the transaction fails, each operation is retried on its own so
+        one bad row does not fail every caller in the batch.
+        """
+        with self.session_factory() as db:
+            try:
+                results = [self._apply(db, op) for op in batch]
+                db.commit()
+                return [(True, result) for result in results]
+            except Exception as e:
+                db.rollback()
+                if len(batch) == 1:
+                    return [(False, e)]
+                logger.warning(
+                    "Group commit failed, retrying operations individually",
+                    extra={"batch_size": len(batch), "error": str(e)},
+                )
+        return [self._commit([op])[0] for op in batch]
+
+    def _apply(self, db: Session, op: _WriteOp) -> Optional[int]:
+        if op.kind == "insert":
+            existing_id = op.lookup(db) if op.lookup else None
+            if existing_id is not None:
+                return existing_id
+            db.add(op.lead)
+            # Flush so the id is assigned and later lookups in the batch see it
+            db.flush()
+            return op.lead.id
+
+        lead = db.get(IntakeLead, op.lead_id)
+        if lead is None:
+            return op.lead_id
+        if op.kind == "requeue":
+            lead.clio_status = LEAD_STATUS_PENDING
+            lead.claimed_at = None
+        else:
+            lead.mark_sent_to_clio(*op.update)
+        return op.lead_id
+
+
+# Shared writer used by the intake queue and idempotency layer
+intake_writer = IntakeWriter()
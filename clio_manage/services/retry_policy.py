@@ -0,0 +1,144 @@
+"""
+Bounded retries for Clio API calls.
+
+``RetryPolicy.run`` re-sends a request after transient failures:
+
+- 429 responses, for any method. Clio rejected the request without acting
+  on it, and ``Retry-After`` is honoured.
+- Connection failures before the request went out (connect errors and
+  timeouts, pool timeouts), for any method.
+- 502/503/504 responses, read/write errors and connection resets, only for
+  idempotent methods. A POST may already have taken effect.
+
+Delays use exponential backoff with full jitter (uniform between 0 and
+``base_delay * 2**retry``, capped at ``max_delay``), so a burst of failing
+callers does not retry in lockstep. A call stops after ``max_retries``
+retries, or when the next delay would overrun its ``total_timeout`` budget.
+It then returns the last response (callers still ``raise_for_status()``) or
+re-raises the last error.
+"""
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, FrozenSet, Optional
+
+import httpx
+from loguru import logger
+
+from clio_manage import config
+from clio_manage.utils.metrics import registry
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Raised before any of the request reached the server
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_TRANSIENT_ERRORS = (
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+)
+
+RETRIES = registry.counter(
+    "clio_api_retries_total",
+    "Clio API requests retried, by method and reason (status code or error)",
+    ("method", "reason"),
+)
+RETRIES_EXHAUSTED = registry.counter(
+    "clio_api_retries_exhausted_total",
+    "Clio API calls that still failed when their retries or time ran out",
+    ("method", "reason"),
+)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Retry rules, backoff and time budget for one kind of call."""
+
+    def __init__(
+        self,
+        max_retries: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        total_timeout: Optional[float] = None,
+        idempotent_methods: FrozenSet[str] = IDEMPOTENT_METHODS,
+        retry_statuses: FrozenSet[int] = RETRY_STATUSES,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.max_retries = (
+            config.CLIO_API_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.base_delay = base_delay or config.CLIO_API_RETRY_BASE_SECONDS
+        self.max_delay = max_delay or config.CLIO_API_RETRY_MAX_BACKOFF_SECONDS
+        self.total_timeout = total_timeout or config.CLIO_API_RETRY_BUDGET_SECONDS
+        self.idempotent_methods = idempotent_methods
+        self.retry_statuses = retry_statuses
+        self.clock = clock
+        self.sleep = sleep
+
+    def backoff(self, retry: int) -> float:
+        """Full-jitter delay before retry number ``retry`` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+    def should_retry_response(self, method: str, response: httpx.Response) -> bool:
+        if response.status_code not in self.retry_statuses:
+            return False
+        return response.status_code == 429 or method in self.idempotent_methods
+
+    def should_retry_error(self, method: str, error: Exception) -> bool:
+        if isinstance(error, _NOT_SENT_ERRORS):
+            return True
+        return (
+            isinstance(error, _TRANSIENT_ERRORS) and method in self.idempotent_methods
+        )
+
+    async def run(
+        self, method: str, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """Call ``send()`` until it succeeds or retrying is no longer allowed."""
+        method = method.upper()
+        deadline = self.clock() + self.total_timeout
+        retry = 0
+        while True:
+            response = error = delay = None
+            try:
+                response = await send()
+            except Exception as e:
+                if not self.should_retry_error(method, e):
+                    raise
+                error, reason = e, type(e).__name__
+            else:
+                if not self.should_retry_response(method, response):
+                    return response
+                reason = str(response.status_code)
+                delay = _retry_after(response)
+
+            if delay is None:
+                delay = self.backoff(retry)
+            if retry >= self.max_retries or self.clock() + delay > deadline:
+                RETRIES_EXHAUSTED.inc(method, reason)
+                logger.warning(
+                    f"Giving up on Clio {method} after {retry} retries ({reason})"
+                )
+                if error is not None:
+                    raise error
+                return response
+
+            RETRIES.inc(method, reason)
+            logger.info(
+                f"Retrying Clio {method} in {delay:.1f}s ({reason}, retry {retry + 1})"
+            )
+            await self.sleep(delay)
+            retry += 1
+
+
+# Shared by every Clio API call
+clio_retry_policy = RetryPolicy()
@@ -3,17 +3,19 @@ from typing import Optional
 
 import httpx
 
+from clio_manage.services.http_transport import PooledTransport, clio_transport
 from clio_manage.utils.clio_api_helpers import clio_api_helper
 
 
 class TriageService:
-    def __init__(self, api_helper=None):
+    def __init__(self, api_helper=None, transport: Optional[PooledTransport] = None):
         self.api_helper = api_helper or clio_api_helper
+        self.transport = transport or clio_transport
         self.base_url = "https://app.clio.com/api/v4"
 
     async def triage_lead(
         self,
-        client: httpx.AsyncClient,
+        client: Optional[httpx.AsyncClient],
         lead_data: dict,
         note_content: str,
         assignee_id: str,
@@ -22,6 +24,8 @@ class TriageService:
         lead_tag_id: Optional[str] = None,
         notify_email: Optional[str] = None,
     ):
+        # Pooled shared client unless the caller brings its own
+        client = client or self.transport.client
         # 1. Create Contact
         contact_payload = {
             "data": {
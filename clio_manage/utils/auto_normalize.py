@@ -1,17 +1,100 @@
-from fastapi import Depends, Request
-from your_utils_module import recursive_normalize
+"""
+Parse-once JSON request bodies.
 
+The raw body is read once, parsed with orjson when it is installed (stdlib
+``json`` otherwise) and cached on ``request.state.normalized_body``.
+Everything downstream reuses that object:
 
-async def normalized_body(request: Request):
-    data = await request.json()
-    return recursive_normalize(data)
+- routes using ``NormalizedJSONRoute`` get it from ``await request.json()``,
+  which is also what FastAPI validates body parameters (Pydantic models,
+  ``Dict[str, Any]``) against
+- other routes can declare ``payload = Depends(normalized_body)``
 
+Values are kept exactly as sent unless the route opts in to decoding: only
+the top-level fields named in its route class's ``decode_fields`` go through
+``normalize_encoded`` (``NormalizedJSONRoute.decoding("field", ...)``).
+Free text that happens to look like JSON (``{}``, ``"quoted"``) therefore
+reaches handlers untouched; Pydantic models that expect encoded values
+decode their own ``decode_fields`` (see ``ClioBaseModel``).
 
-# Usage in endpoint:
-from .models import MatterResponse  # This inherits from ClioBaseModel
+Parsing is lazy: routes that never ask for the JSON body (e.g. ones reading
+``request.stream()``) are unaffected.
+"""
 
+import json
+from typing import Any, Callable, ClassVar, Coroutine, FrozenSet, Optional, Type
 
-@app.post("/matters")
-async def create_matter(payload=Depends(normalized_body)):
-    model = MatterResponse(**payload)
-    # ...proceed with normalized data
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from clio_manage.utils.field_normalizer import normalize_encoded
+from clio_manage.utils.metrics import time_stage
+
+try:
+    import orjson
+
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so FastAPI
+    # still turns malformed bodies into 422s
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+async def normalized_body(request: Request) -> Any:
+    """
+    The request's JSON body, parsed once per request.
+
+    Only the fields the matched route declares in ``decode_fields`` are
+    decoded. Usable directly as a FastAPI dependency.
+    """
+    try:
+        return request.state.normalized_body
+    except AttributeError:
+        pass
+    body = await request.body()
+    decode_fields = getattr(request.scope.get("route"), "decode_fields", frozenset())
+    with time_stage("body_parse"):
+        data = _decode(_loads(body), decode_fields)
+    request.state.normalized_body = data
+    return data
+
+
+def _decode(data: Any, decode_fields: Optional[FrozenSet[str]]) -> Any:
+    """Decode ``decode_fields`` of an object body; None means every value."""
+    # Freshly parsed, so normalizing in place copies nothing
+    if decode_fields is None:
+        return normalize_encoded(data, in_place=True)
+    if decode_fields and isinstance(data, dict):
+        for name in decode_fields.intersection(data):
+            data[name] = normalize_encoded(data[name], in_place=True)
+    return data
+
+
+class NormalizedRequest(Request):
+    """Request whose ``json()`` returns the parse-once normalized body."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = await normalized_body(self)
+        return self._json
+
+
+class NormalizedJSONRoute(APIRoute):
+    """Route class that hands endpoints a ``NormalizedRequest``."""
+
+    # Top-level body fields whose values may arrive base64/JSON-encoded and
+    # are decoded after parsing; None means every field
+    decode_fields: ClassVar[Optional[FrozenSet[str]]] = frozenset()
+
+    @classmethod
+    def decoding(cls, *fields: str) -> Type["NormalizedJSONRoute"]:
+        """Route class that also decodes the named top-level body fields."""
+        return type(cls.__name__, (cls,), {"decode_fields": frozenset(fields)})
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def normalized_handler(request: Request) -> Response:
+            return await handler(NormalizedRequest(request.scope, request.receive))
+
+        return normalized_handler
@@ -4,11 +4,31 @@ Clio API helper functions for rate limiting and pagination.
 
 import asyncio
 import importlib
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
 
 import httpx
+from loguru import logger
+
+from clio_manage import config
+from clio_manage.services.http_transport import PooledTransport, clio_transport
+from clio_manage.services.retry_policy import RetryPolicy, clio_retry_policy
+from clio_manage.utils.clio_fields import RESOURCE_FIELDS
+from clio_manage.utils.metrics import registry
+from clio_manage.utils.rate_limit_store import RateLimitStore, get_rate_limit_store
 
 try:
     config_module = importlib.import_module("app.config")
@@ -29,70 +49,142 @@ except (ImportError, ModuleNotFoundError, AttributeError):
     settings = DummySettings()
 
 
-@dataclass
-class RateLimit:
-    """Rate limit configuration for Clio API."""
+RATE_LIMIT_RATE = registry.gauge(
+    "clio_rate_limit_requests_per_second",
+    "Current token-bucket refill rate for a Clio request budget",
+    ("budget",),
+)
 
-    max_requests: int = 100  # Max requests per window
-    window_seconds: int = 60  # Time window in seconds
-    current_requests: int = 0
-    window_start: Optional[datetime] = None
 
-    def __post_init__(self):
-        if self.window_start is None:
-            self.window_start = datetime.utcnow()
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    try:
+        return float(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
 
-    def can_make_request(self) -> bool:
-        """Check if we can make a request within rate limits."""
-        now = datetime.utcnow()
 
-        # Reset window if expired
-        if self.window_start is not None and (
-            now - self.window_start >= timedelta(seconds=self.window_seconds)
-        ):
-            self.current_requests = 0
-            self.window_start = now
+@dataclass
+class RateLimit:
+    """
+    Token-bucket parameters for the Clio API budget.
 
-        return self.current_requests < self.max_requests
+    Starts from the configured quota (``max_requests`` per ``window_seconds``)
+    and follows Clio's ``X-RateLimit-*`` response headers: the quota comes
+    from ``X-RateLimit-Limit``, and the rate is lowered to spread the
+    remaining requests over the time left in Clio's window, so the server's
+    count is never exceeded. All times are monotonic.
+    """
 
-    def record_request(self) -> None:
-        """Record that a request was made."""
-        self.current_requests += 1
+    max_requests: int = 100  # Max requests per window
+    window_seconds: float = 60  # Time window in seconds
+    rate: float = field(init=False)  # Tokens added per second
+    burst: float = field(init=False)  # Bucket capacity
+    # No requests before this time (quota exhausted or 429 Retry-After)
+    blocked_until: float = 0.0
 
-    def time_until_reset(self) -> float:
-        """Get seconds until rate limit window resets."""
-        now = datetime.utcnow()
-        if self.window_start is None:
-            self.window_start = now
-        reset_time = self.window_start + timedelta(seconds=self.window_seconds)
-        return max(0, (reset_time - now).total_seconds())
+    def __post_init__(self):
+        self.rate = self.quota_rate
+        self.burst = self.max_requests
+
+    @property
+    def quota_rate(self) -> float:
+        return self.max_requests / self.window_seconds
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """Adjust the rate and burst to the quota Clio reports."""
+        limit = _header_number(headers, "X-RateLimit-Limit")
+        remaining = _header_number(headers, "X-RateLimit-Remaining")
+        reset = _header_number(headers, "X-RateLimit-Reset")
+        if limit and limit > 0:
+            self.max_requests = int(limit)
+        if remaining is None or reset is None:
+            self.rate, self.burst = self.quota_rate, self.max_requests
+            return
+
+        # Clio sends the reset as a Unix timestamp; accept a delta too
+        reset_in = reset - time.time() if reset > 1e9 else reset
+        reset_in = min(max(reset_in, 1.0), self.window_seconds)
+        if remaining <= 0:
+            self.block_for(reset_in)
+        # Spend what is left evenly until the window resets, never faster
+        # than the quota itself
+        self.rate = min(self.quota_rate, max(remaining, 1) / reset_in)
+        self.burst = max(1, min(self.max_requests, remaining))
+
+    def block_for(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def time_until_unblocked(self) -> float:
+        return max(0.0, self.blocked_until - time.monotonic())
 
 
 class ClioRateLimiter:
-    """Rate limiter for Clio API calls with automatic backoff."""
+    """
+    Token-bucket rate limiter for Clio API calls.
+
+    Tokens come from a ``RateLimitStore`` (CLIO_RATE_LIMIT_STORE by default)
+    so every worker process spends the same ``budget_key`` budget. Coroutines
+    in one process queue on a lock and are let through in order, and the
+    rate follows the rate-limit headers of every response.
+    """
 
-    def __init__(self, max_requests: int = 100, window_seconds: int = 60):
+    def __init__(
+        self,
+        max_requests: int = 100,
+        window_seconds: int = 60,
+        store: Optional[RateLimitStore] = None,
+        budget_key: str = "clio_api",
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
         self.rate_limit = RateLimit(max_requests, window_seconds)
-        self.backoff_factor = 1.5
-        self.max_backoff = 60  # Max wait time in seconds
+        self.store = store or get_rate_limit_store()
+        self.budget_key = budget_key
+        self.retry_policy = retry_policy or clio_retry_policy
+        self.max_backoff = 60  # Max single wait for a token, in seconds
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+        RATE_LIMIT_RATE.set(self.rate_limit.rate, budget_key)
+
+    def _loop_lock(self) -> asyncio.Lock:
+        # asyncio.Lock binds to one loop; Celery tasks each run a new one
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock, self._lock_loop = asyncio.Lock(), loop
+        return self._lock
 
     async def wait_if_needed(self) -> None:
-        """Wait if we're hitting rate limits."""
-        if not self.rate_limit.can_make_request():
-            wait_time = self.rate_limit.time_until_reset()
-            if wait_time > 0:
-                print(f"Rate limit reached. Waiting {wait_time:.1f} seconds...")
-                await asyncio.sleep(wait_time)
-                # Reset after waiting
-                self.rate_limit.current_requests = 0
-                self.rate_limit.window_start = datetime.utcnow()
+        """Take a token from the budget, waiting until one is available."""
+        async with self._loop_lock():
+            while True:
+                wait_time = self.rate_limit.time_until_unblocked()
+                if wait_time <= 0:
+                    wait_time = await self._reserve()
+                    if wait_time <= 0:
+                        return
+                if wait_time >= 1:
+                    logger.info(f"Clio rate limit reached; waiting {wait_time:.1f}s")
+                await asyncio.sleep(min(wait_time, self.max_backoff))
+
+    async def _reserve(self) -> float:
+        args = (self.budget_key, self.rate_limit.rate, self.rate_limit.burst)
+        if self.store.blocking:
+            return await asyncio.to_thread(self.store.reserve, *args)
+        return self.store.reserve(*args)
+
+    def observe(self, response: httpx.Response) -> None:
+        """Adapt the budget to a response's rate-limit headers."""
+        self.rate_limit.observe(response.headers)
+        RATE_LIMIT_RATE.set(self.rate_limit.rate, self.budget_key)
 
     async def make_request(
         self, client: httpx.AsyncClient, method: str, url: str, **kwargs
     ) -> httpx.Response:
-        """Make a rate-limited request to Clio API."""
-        await self.wait_if_needed()
+        """
+        Make a rate-limited request to Clio API.
 
+        Transient failures are retried per ``retry_policy``; every attempt
+        takes its own token from the budget.
+        """
         # Add required headers
         headers = kwargs.get("headers", {})
         headers.update(
@@ -104,19 +196,18 @@ class ClioRateLimiter:
         )
         kwargs["headers"] = headers
 
-        # Make the request
-        response = await client.request(method, url, **kwargs)
-        self.rate_limit.record_request()
+        async def send() -> httpx.Response:
+            await self.wait_if_needed()
+            response = await client.request(method, url, **kwargs)
+            self.observe(response)
+            if response.status_code == 429:  # Too Many Requests
+                # Holds back every coroutine sharing this limiter, not just
+                # the one being retried
+                retry_after = float(response.headers.get("Retry-After", 60))
+                self.rate_limit.block_for(retry_after)
+            return response
 
-        # Handle rate limit responses
-        if response.status_code == 429:  # Too Many Requests
-            retry_after = int(response.headers.get("Retry-After", 60))
-            print(f"Rate limited by server. Waiting {retry_after} seconds...")
-            await asyncio.sleep(retry_after)
-            # Retry the request
-            return await self.make_request(client, method, url, **kwargs)
-
-        return response
+        return await self.retry_policy.run(method, send)
 
 
 @dataclass
@@ -129,13 +220,22 @@ class PaginationInfo:
     total_pages: Optional[int] = None
     has_next: bool = False
     has_prev: bool = False
+    # Cursor URL of the next page (``meta.paging.next``)
+    next_url: Optional[str] = None
 
     @classmethod
-    def from_response_headers(cls, headers: Dict[str, str]) -> "PaginationInfo":
-        """Create pagination info from response headers."""
+    def from_response_headers(
+        cls, headers: Mapping[str, str], per_page: int = 50
+    ) -> "PaginationInfo":
+        """
+        Create pagination info from response headers.
+
+        ``per_page`` is the page size that was requested, used when the
+        response has no ``X-Per-Page`` header.
+        """
         return cls(
             current_page=int(headers.get("X-Current-Page", 1)),
-            per_page=int(headers.get("X-Per-Page", 50)),
+            per_page=int(headers.get("X-Per-Page", per_page)),
             total_count=(
                 int(headers.get("X-Total-Count", 0))
                 if headers.get("X-Total-Count")
@@ -150,50 +250,130 @@ class PaginationInfo:
             has_prev=headers.get("X-Has-Previous-Page", "false").lower() == "true",
         )
 
+    @classmethod
+    def from_response(
+        cls, response: httpx.Response, body: Any, per_page: int = 50
+    ) -> "PaginationInfo":
+        """Create pagination info from headers and the body's ``meta`` block."""
+        # response.headers is case-insensitive; a dict() copy is not
+        info = cls.from_response_headers(response.headers, per_page)
+        meta = body.get("meta") if isinstance(body, dict) else None
+        if isinstance(meta, dict):
+            paging = meta.get("paging") or {}
+            info.next_url = paging.get("next")
+            info.has_next = info.has_next or bool(info.next_url)
+            info.has_prev = info.has_prev or bool(paging.get("previous"))
+            if info.total_count is None and isinstance(meta.get("records"), int):
+                info.total_count = meta["records"]
+        if info.total_pages is None and info.total_count is not None:
+            info.total_pages = max(1, math.ceil(info.total_count / info.per_page))
+        return info
+
 
 class ClioPaginator:
-    """Helper for paginating through Clio API responses."""
+    """
+    Helper for paginating through Clio API responses.
+
+    ``paginate_all`` keeps up to ``prefetch`` page requests in flight while
+    earlier pages are being consumed; every request still waits for the rate
+    limiter. Pages are always yielded in order.
+    """
 
-    def __init__(self, rate_limiter: ClioRateLimiter, per_page: int = 50):
+    def __init__(
+        self,
+        rate_limiter: ClioRateLimiter,
+        per_page: int = 50,
+        prefetch: Optional[int] = None,
+    ):
         self.rate_limiter = rate_limiter
         self.per_page = per_page
+        self.prefetch = max(1, prefetch or config.CLIO_PAGINATION_PREFETCH)
+
+    async def _fetch(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        kwargs: Dict[str, Any],
+        per_page: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], PaginationInfo]:
+        # make_request adds its headers in place; concurrent pages each get
+        # their own copy
+        kwargs = {**kwargs, "headers": dict(kwargs.get("headers") or {})}
+        response = await self.rate_limiter.make_request(client, method, url, **kwargs)
+        response.raise_for_status()
+
+        # Parse response
+        data = response.json()
+        pagination = PaginationInfo.from_response(
+            response, data, per_page or self.per_page
+        )
+
+        # Extract data array (Clio typically wraps data in a "data" key)
+        items = data.get("data", []) if isinstance(data, dict) else []
+
+        return items, pagination
 
     async def paginate_all(
-        self, client: httpx.AsyncClient, url: str, method: str = "GET", **kwargs
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        method: str = "GET",
+        fields: Optional[str] = None,
+        **kwargs,
     ) -> AsyncGenerator[Tuple[List[Dict[str, Any]], PaginationInfo], None]:
         """
         Paginate through all pages of a Clio API endpoint.
 
+        Once the page count is known (``X-Total-Pages``, or the total record
+        count) the following pages are requested ``prefetch`` at a time.
+        Otherwise the next page (by cursor or page number) is requested as
+        soon as the current one arrives, while the caller processes it.
+
+        ``fields`` is sent as Clio's ``fields`` projection on every page.
+
         Yields:
             Tuple of (data_list, pagination_info) for each page
         """
-        page = 1
-        has_more = True
-
-        while has_more:
-            # Add pagination parameters
-            params = kwargs.get("params", {})
-            params.update({"page": page, "per_page": self.per_page})
-            kwargs["params"] = params
-
-            # Make the request
-            response = await self.rate_limiter.make_request(
-                client, method, url, **kwargs
+        params = kwargs.pop("params", None) or {}
+        if fields:
+            params = {**params, "fields": fields}
+
+        def request_page(page: int) -> "asyncio.Task":
+            page_params = {**params, "page": page, "per_page": self.per_page}
+            return asyncio.ensure_future(
+                self._fetch(client, method, url, {**kwargs, "params": page_params})
             )
-            response.raise_for_status()
-
-            # Parse response
-            data = response.json()
-            pagination = PaginationInfo.from_response_headers(dict(response.headers))
-
-            # Extract data array (Clio typically wraps data in a "data" key)
-            items = data.get("data", []) if isinstance(data, dict) else []
-
-            yield items, pagination
 
-            # Check if we should continue
-            has_more = pagination.has_next
-            page += 1
+        def request_cursor(next_url: str) -> "asyncio.Task":
+            # The cursor URL carries the query string (fields, per_page)
+            return asyncio.ensure_future(self._fetch(client, method, next_url, kwargs))
+
+        pending: Deque[asyncio.Task] = deque([request_page(1)])
+        next_page = 2
+        try:
+            while pending:
+                items, pagination = await pending.popleft()
+                if pagination.total_pages is not None:
+                    while (
+                        next_page <= pagination.total_pages
+                        and len(pending) < self.prefetch
+                    ):
+                        pending.append(request_page(next_page))
+                        next_page += 1
+                elif not pending and pagination.next_url:
+                    pending.append(request_cursor(pagination.next_url))
+                elif not pending and pagination.has_next:
+                    pending.append(request_page(next_page))
+                    next_page += 1
+
+                yield items, pagination
+        finally:
+            # Consumer stopped early or a page failed
+            for task in pending:
+                if task.done() and not task.cancelled():
+                    task.exception()  # retrieved, so asyncio does not log it
+                task.cancel()
 
     async def get_page(
         self,
@@ -202,6 +382,7 @@ class ClioPaginator:
         page: int = 1,
         per_page: Optional[int] = None,
         method: str = "GET",
+        fields: Optional[str] = None,
         **kwargs,
     ) -> Tuple[List[Dict[str, Any]], PaginationInfo]:
         """
@@ -211,81 +392,117 @@ class ClioPaginator:
             Tuple of (data_list, pagination_info)
         """
         # Set pagination parameters
+        per_page = per_page or self.per_page
         params = kwargs.get("params", {})
-        params.update({"page": page, "per_page": per_page or self.per_page})
+        params.update({"page": page, "per_page": per_page})
+        if fields:
+            params["fields"] = fields
         kwargs["params"] = params
 
-        # Make the request
-        response = await self.rate_limiter.make_request(client, method, url, **kwargs)
-        response.raise_for_status()
-
-        # Parse response
-        data = response.json()
-        pagination = PaginationInfo.from_response_headers(dict(response.headers))
-
-        # Extract data array
-        items = data.get("data", []) if isinstance(data, dict) else []
-
-        return items, pagination
+        return await self._fetch(client, method, url, kwargs, per_page)
 
 
 class ClioAPIHelper:
-    """High-level helper for Clio API operations with rate limiting and pagination."""
+    """
+    High-level helper for Clio API operations with rate limiting and pagination.
+
+    Methods use the shared pooled ``transport`` client when ``client`` is
+    None or omitted. List methods request the resource's declared
+    ``fields`` projection (see ``clio_fields.declare_fields``) unless given
+    ``fields`` explicitly; an empty string fetches the default representation.
+    """
 
     def __init__(
-        self, max_requests: int = 100, window_seconds: int = 60, per_page: int = 50
+        self,
+        max_requests: int = 100,
+        window_seconds: int = 60,
+        per_page: int = 50,
+        transport: Optional[PooledTransport] = None,
     ):
         self.rate_limiter = ClioRateLimiter(max_requests, window_seconds)
         self.paginator = ClioPaginator(self.rate_limiter, per_page)
+        self.transport = transport or clio_transport
         self.base_url = "https://app.clio.com/api/v4"
 
-    async def get_all_contacts(self, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
-        """Get all contacts from Clio API."""
-        all_contacts = []
-        url = f"{self.base_url}/contacts"
-
-        async for contacts, pagination in self.paginator.paginate_all(client, url):
-            all_contacts.extend(contacts)
-            print(
-                f"Retrieved {len(contacts)} contacts (page {pagination.current_page})"
+    async def _iter_pages(
+        self,
+        resource: str,
+        label: str,
+        client: Optional[httpx.AsyncClient],
+        fields: Optional[str],
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        client = client or self.transport.client
+        url = f"{self.base_url}/{resource}"
+        if fields is None:
+            fields = RESOURCE_FIELDS.get(resource)
+
+        async for items, pagination in self.paginator.paginate_all(
+            client, url, fields=fields
+        ):
+            logger.debug(
+                f"Retrieved {len(items)} {label} (page {pagination.current_page})"
             )
+            yield items
+
+    def iter_contacts(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        fields: Optional[str] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield Clio contacts one page at a time."""
+        return self._iter_pages("contacts", "contacts", client, fields)
+
+    def iter_custom_actions(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        fields: Optional[str] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield Clio custom actions one page at a time."""
+        return self._iter_pages("custom_actions", "custom actions", client, fields)
+
+    def iter_webhook_subscriptions(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        fields: Optional[str] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield Clio webhook subscriptions one page at a time."""
+        return self._iter_pages(
+            "webhook_subscriptions", "webhook subscriptions", client, fields
+        )
 
-        return all_contacts
+    async def get_all_contacts(
+        self, client: Optional[httpx.AsyncClient] = None
+    ) -> List[Dict[str, Any]]:
+        """Get all contacts from Clio API (prefer ``iter_contacts`` for syncs)."""
+        return [item async for page in self.iter_contacts(client) for item in page]
 
     async def get_all_custom_actions(
-        self, client: httpx.AsyncClient
+        self, client: Optional[httpx.AsyncClient] = None
     ) -> List[Dict[str, Any]]:
         """Get all custom actions from Clio API."""
-        all_actions = []
-        url = f"{self.base_url}/custom_actions"
-
-        async for actions, pagination in self.paginator.paginate_all(client, url):
-            all_actions.extend(actions)
-            print(
-                f"Retrieved {len(actions)} custom actions (page {pagination.current_page})"
-            )
-
-        return all_actions
+        return [
+            item async for page in self.iter_custom_actions(client) for item in page
+        ]
 
     async def get_all_webhook_subscriptions(
-        self, client: httpx.AsyncClient
+        self, client: Optional[httpx.AsyncClient] = None
     ) -> List[Dict[str, Any]]:
         """Get all webhook subscriptions from Clio API."""
-        all_subscriptions = []
-        url = f"{self.base_url}/webhook_subscriptions"
-
-        async for subscriptions, pagination in self.paginator.paginate_all(client, url):
-            all_subscriptions.extend(subscriptions)
-            print(
-                f"Retrieved {len(subscriptions)} webhook subscriptions (page {pagination.current_page})"
-            )
-
-        return all_subscriptions
+        return [
+            item
+            async for page in self.iter_webhook_subscriptions(client)
+            for item in page
+        ]
 
     async def create_custom_action(
-        self, client: httpx.AsyncClient, name: str, url: str, http_method: str = "GET"
+        self,
+        client: Optional[httpx.AsyncClient],
+        name: str,
+        url: str,
+        http_method: str = "GET",
     ) -> Dict[str, Any]:
         """Create a custom action in Clio."""
+        client = client or self.transport.client
         api_url = f"{self.base_url}/custom_actions"
         payload = {"data": {"name": name, "http_method": http_method, "url": url}}
 
@@ -296,9 +513,10 @@ class ClioAPIHelper:
         return response.json()
 
     async def create_webhook_subscription(
-        self, client: httpx.AsyncClient, url: str, events: List[str]
+        self, client: Optional[httpx.AsyncClient], url: str, events: List[str]
     ) -> Dict[str, Any]:
         """Create a webhook subscription in Clio."""
+        client = client or self.transport.client
         api_url = f"{self.base_url}/webhook_subscriptions"
         payload = {"data": {"url": url, "events": events}}
 
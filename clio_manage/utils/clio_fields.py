@@ -0,0 +1,69 @@
+"""
+Clio v4 ``fields`` projections.
+
+Clio returns a default representation of each record unless the request
+names the fields it wants. Nested resources select their own sub-fields
+with braces: ``id,name,primary_address{street,city}``.
+
+Field sets are declared at the bottom of this module with ``declare_fields``;
+``ClioAPIHelper`` then requests them for that resource automatically.
+"""
+
+from typing import Dict, Sequence, Union
+
+# Clio resource path (e.g. "contacts") -> ``fields`` value to request
+RESOURCE_FIELDS: Dict[str, str] = {}
+
+
+def clio_fields(*names: str, **nested: Union[str, Sequence[str]]) -> str:
+    """
+    Build a ``fields`` query value.
+
+    Keyword arguments select sub-fields of nested resources; pass the result
+    of another ``clio_fields`` call to nest deeper.
+
+    Example:
+        clio_fields("id", "name", primary_address=("street", "city"))
+        -> "id,name,primary_address{street,city}"
+    """
+    parts = list(names)
+    for resource, sub_fields in nested.items():
+        if not isinstance(sub_fields, str):
+            sub_fields = ",".join(sub_fields)
+        parts.append(f"{resource}{{{sub_fields}}}")
+    return ",".join(parts)
+
+
+def declare_fields(
+    resource: str, *names: str, **nested: Union[str, Sequence[str]]
+) -> str:
+    """Register the fields to request for ``resource`` and return them."""
+    fields = RESOURCE_FIELDS[resource] = clio_fields(*names, **nested)
+    return fields
+
+
+# Clio v4 fields read by ClioContactService._upsert_contact; contact syncs
+# request only these
+CONTACT_CLIO_FIELDS = declare_fields(
+    "contacts",
+    "id",
+    "first_name",
+    "last_name",
+    "type",
+    "title",
+    "is_client",
+    "primary_email_address",
+    "primary_phone_number",
+    company=("id", "name"),
+    primary_address=("street", "city", "province", "postal_code", "country"),
+)
+
+# Clio v4 fields read by ClioCustomActionService._sync_single_custom_action
+CUSTOM_ACTION_CLIO_FIELDS = declare_fields(
+    "custom_actions", "id", "label", "target_url"
+)
+
+# Clio v4 fields returned by ClioAPIHelper.get_all_webhook_subscriptions
+WEBHOOK_SUBSCRIPTION_CLIO_FIELDS = declare_fields(
+    "webhook_subscriptions", "id", "url", "model", "events", "status", "expires_at"
+)
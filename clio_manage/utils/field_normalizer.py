@@ -0,0 +1,339 @@
+"""
+Prescreened decoding of base64- and JSON-encoded field values.
+
+Some Clio and intake sources send structured fields as JSON text, or as
+base64 of JSON text. ``normalize_encoded`` unwraps those values like
+``recursive_normalize`` does. It first applies cheap checks, so plain
+strings (names, phone numbers, emails) never reach ``base64.b64decode`` or
+``json.loads``. The checks, in order:
+
+- base64: the length is a multiple of 4, the first character is one that
+  base64-encoded ``{``, ``[`` or ``"`` (optionally after ASCII whitespace)
+  starts with (``eyJ...``, ``W3...``), and every character is in the base64
+  alphabet
+- JSON: the value starts with ``{``, ``[`` or ``"`` after leading whitespace
+
+JSON numbers, booleans and null are not decoded, so a phone number such as
+``"5551234567"`` or a value such as ``"true"`` stays a string.
+
+This is the single normalizer for the project; ``recursive_field_normalizer``,
+``normalize_fields_recursive`` and ``universal_normalizer_function`` re-export
+it under their old names.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from clio_manage import config
+from clio_manage.utils.metrics import registry
+
+_BASE64 = re.compile(r"[A-Za-z0-9+/]+={0,2}")
+_JSON_START = re.compile(r'\s*[\[{"]')
+
+# First base64 character of text starting with "{" (e), "[" (W), '"' (I), or
+# with space (I), tab/newline (C) or carriage return (D) before one of them
+_BASE64_JSON_LEADS = frozenset("eWICD")
+
+_CONTAINERS = (dict, list)
+
+# Far deeper than any real payload; guards against pathological nesting
+DEFAULT_MAX_DEPTH = 128
+
+# Longer values (whole documents) are decoded without caching
+MAX_CACHED_VALUE_LENGTH = 64 * 1024
+
+# DecodeCache entry kinds
+_UNCHANGED, _TEXT, _JSON = 0, 1, 2
+
+CACHE_LOOKUPS = registry.counter(
+    "intake_decode_cache_lookups_total",
+    "Field decode cache lookups by result",
+    ("result",),
+)
+CACHE_EVICTIONS = registry.counter(
+    "intake_decode_cache_evictions_total",
+    "Field decode cache entries evicted to stay within NORMALIZER_CACHE_SIZE",
+)
+
+
+def looks_like_json(value: str) -> bool:
+    """True if ``value`` could be a JSON object, array or string."""
+    return _JSON_START.match(value) is not None
+
+
+def looks_like_base64_json(value: str) -> bool:
+    """True if ``value`` could be base64 of text that ``looks_like_json``."""
+    return (
+        len(value) >= 4
+        and len(value) % 4 == 0
+        and value[0] in _BASE64_JSON_LEADS
+        and _BASE64.fullmatch(value) is not None
+    )
+
+
+def _decode(value: str) -> Tuple[Any, Optional[str]]:
+    """
+    Unwrap one layer of encoding: base64 of JSON text, then JSON text.
+
+    Returns:
+        Tuple of (result, JSON text the result was parsed from, or None)
+    """
+    if looks_like_base64_json(value):
+        try:
+            decoded = base64.b64decode(value, validate=True).decode("utf-8")
+        except (binascii.Error, UnicodeDecodeError):
+            decoded = None
+        if decoded is not None and looks_like_json(decoded):
+            value = decoded
+    if looks_like_json(value):
+        try:
+            return json.loads(value), value
+        except ValueError:
+            return value, None
+    return value, None
+
+
+def decode_value(value: Any) -> Any:
+    """
+    Unwrap one layer of encoding: base64 of JSON text, then JSON text.
+
+    Values that fail the prescreen, or fail to decode, are returned unchanged.
+    """
+    if not isinstance(value, str):
+        return value
+    return _decode(value)[0]
+
+
+def _normalize_string(value: str) -> Tuple[Any, Optional[str]]:
+    decoded, text = _decode(value)
+    if isinstance(decoded, str) and decoded is not value:
+        return _decode(decoded)
+    return decoded, text
+
+
+class DecodeCache:
+    """
+    Bounded LRU cache of ``normalize_value`` results for candidate strings.
+
+    Envelopes repeat the same encoded blobs across leads (shared metadata,
+    the root-level message) and webhook bursts repeat nested structures, so
+    repeated values skip base64 and UTF-8 decoding. Only strings that pass
+    the prescreen are looked up; plain text is cheaper to screen than to
+    hash.
+
+    Entries are keyed on a 128-bit BLAKE2b digest of the raw value, so large
+    raw values are not kept alive and distinct values cannot collide in
+    practice (unlike ``hash()``, whose collisions would hand one value
+    another's decoded fields). Values that do not decode
+    are cached too. A decoded dict/list is stored as its JSON text and parsed
+    again on every hit, so callers never share (and mutate) one object.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        max_value_length: int = MAX_CACHED_VALUE_LENGTH,
+    ):
+        self.maxsize = config.NORMALIZER_CACHE_SIZE if maxsize is None else maxsize
+        self.max_value_length = max_value_length
+        self._entries: "OrderedDict[bytes, Tuple[int, Any]]" = OrderedDict()
+        # Normalization also runs in threadpool workers (sync routes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def normalize(self, value: str) -> Any:
+        """``normalize_value`` for a string, served from the cache if possible."""
+        if self.maxsize <= 0 or len(value) > self.max_value_length:
+            return _normalize_string(value)[0]
+
+        key = hashlib.blake2b(
+            value.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            CACHE_LOOKUPS.inc("hit")
+            kind, cached = entry
+            if kind == _UNCHANGED:
+                return value
+            return json.loads(cached) if kind == _JSON else cached
+
+        CACHE_LOOKUPS.inc("miss")
+        result, text = _normalize_string(value)
+        if result is value:
+            entry = (_UNCHANGED, None)
+        elif isinstance(result, str):
+            entry = (_TEXT, result)
+        else:
+            entry = (_JSON, text)
+
+        evicted = 0
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            CACHE_EVICTIONS.inc(amount=evicted)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> Dict[str, Any]:
+        """Hit/miss counts and occupancy, for tuning ``NORMALIZER_CACHE_SIZE``."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+# Shared by every normalize_value call in the process
+decode_cache = DecodeCache()
+
+
+def normalize_value(value: Any) -> Any:
+    """Decode a single value, allowing for one extra layer of encoding."""
+    if not isinstance(value, str) or not (
+        looks_like_json(value) or looks_like_base64_json(value)
+    ):
+        return value
+    return decode_cache.normalize(value)
+
+
+@dataclass
+class NormalizeStats:
+    """Counters for one ``normalize_encoded`` call."""
+
+    fields_scanned: int = 0
+    fields_decoded: int = 0
+    containers_copied: int = 0
+    # Containers below ``max_depth`` that were left as they are
+    depth_limited: int = 0
+
+
+class _Frame:
+    """One dict or list on the traversal stack."""
+
+    __slots__ = ("container", "items", "depth", "key", "owned", "copy")
+
+    def __init__(self, container, depth: int, key: Any, owned: bool):
+        self.container = container
+        self.items = iter(
+            container.items() if isinstance(container, dict) else enumerate(container)
+        )
+        self.depth = depth
+        self.key = key
+        # Owned containers (in-place mode, or freshly decoded) are mutated
+        # directly; others are copied on the first change
+        self.owned = owned
+        self.copy = None
+
+    def set(self, key: Any, value: Any, stats: NormalizeStats) -> None:
+        if self.owned:
+            self.container[key] = value
+            return
+        if self.copy is None:
+            if self.container[key] is value:
+                return
+            self.copy = (
+                dict(self.container)
+                if isinstance(self.container, dict)
+                else list(self.container)
+            )
+            stats.containers_copied += 1
+        self.copy[key] = value
+
+    def result(self) -> Any:
+        return self.container if self.copy is None else self.copy
+
+
+def normalize_encoded(
+    data: Any,
+    in_place: bool = False,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    walk_decoded: bool = False,
+    stats: Optional[NormalizeStats] = None,
+) -> Any:
+    """
+    Decode encoded string values anywhere inside nested dicts and lists.
+
+    The structure is walked with an explicit stack, so deep payloads cannot
+    hit the recursion limit, and each value is visited once.
+
+    Args:
+        data: Value to normalize
+        in_place: Mutate ``data``'s containers instead of copying. By default
+            only containers with a decoded value somewhere below them are
+            copied; unchanged subtrees are returned as-is (shared)
+        max_depth: Containers nested deeper than this are left untouched
+        walk_decoded: Also normalize inside dicts/lists produced by decoding
+        stats: Optional counters to fill in
+
+    Returns:
+        The normalized value
+    """
+    if stats is None:
+        stats = NormalizeStats()
+    if not isinstance(data, _CONTAINERS):
+        stats.fields_scanned += 1
+        decoded = normalize_value(data)
+        if decoded is data:
+            return data
+        stats.fields_decoded += 1
+        if not (walk_decoded and isinstance(decoded, _CONTAINERS)):
+            return decoded
+        data, in_place = decoded, True
+
+    stack = [_Frame(data, 1, None, in_place)]
+    while True:
+        frame = stack[-1]
+        for key, value in frame.items:
+            if isinstance(value, _CONTAINERS):
+                if frame.depth >= max_depth:
+                    stats.depth_limited += 1
+                    continue
+                # Descend; this frame's iterator resumes after the child
+                stack.append(_Frame(value, frame.depth + 1, key, in_place))
+                break
+
+            stats.fields_scanned += 1
+            if not isinstance(value, str):
+                continue
+            decoded = normalize_value(value)
+            if decoded is value:
+                continue
+            stats.fields_decoded += 1
+            if (
+                walk_decoded
+                and isinstance(decoded, _CONTAINERS)
+                and frame.depth < max_depth
+            ):
+                # Freshly decoded, so it can be normalized in place
+                stack.append(_Frame(decoded, frame.depth + 1, key, True))
+                break
+            frame.set(key, decoded, stats)
+        else:
+            stack.pop()
+            if not stack:
+                return frame.result()
+            stack[-1].set(frame.key, frame.result(), stats)
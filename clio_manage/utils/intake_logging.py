@@ -0,0 +1,124 @@
+"""
+Structured logging for the intake hot path.
+
+Log fields are passed as a callable and only evaluated when loguru actually
+emits the record, so nothing is built when the level is filtered out.
+INFO/DEBUG events can be sampled per event name; warnings and errors are
+always logged. ``configure_intake_logging`` installs a queued (enqueue=True)
+sink so request handlers never block on log I/O.
+"""
+
+import random
+import sys
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+from clio_manage import config
+
+Fields = Callable[[], Dict[str, Any]]
+
+_SAMPLED_LEVELS = {"TRACE", "DEBUG", "INFO"}
+
+_handler_id: Optional[int] = None
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse ``"event=rate,event=rate"`` into a dict; bad entries are ignored."""
+    rates = {}
+    for item in spec.split(","):
+        event, sep, rate = item.partition("=")
+        if not sep:
+            continue
+        try:
+            rates[event.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+def request_size(request) -> Optional[int]:
+    """Raw request body size from ``Content-Length``, without re-serializing."""
+    try:
+        return int(request.headers["content-length"])
+    except (KeyError, ValueError):
+        return None
+
+
+class IntakeLogger:
+    """Lazy, per-event sampled logging on top of loguru."""
+
+    def __init__(
+        self,
+        default_rate: Optional[float] = None,
+        sample_rates: Optional[Dict[str, float]] = None,
+    ):
+        self.default_rate = (
+            default_rate if default_rate is not None else config.INTAKE_LOG_SAMPLE_RATE
+        )
+        self.sample_rates = (
+            sample_rates
+            if sample_rates is not None
+            else parse_sample_rates(config.INTAKE_LOG_SAMPLE_RATES)
+        )
+
+    def sampled(self, event: str) -> bool:
+        """Decide whether this occurrence of ``event`` is logged."""
+        rate = self.sample_rates.get(event, self.default_rate)
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+    def debug(self, event: str, message: str, fields: Optional[Fields] = None):
+        self._log("DEBUG", event, message, fields)
+
+    def info(self, event: str, message: str, fields: Optional[Fields] = None):
+        self._log("INFO", event, message, fields)
+
+    def warning(self, event: str, message: str, fields: Optional[Fields] = None):
+        self._log("WARNING", event, message, fields)
+
+    def _log(
+        self, level: str, event: str, message: str, fields: Optional[Fields]
+    ) -> None:
+        if level in _SAMPLED_LEVELS and not self.sampled(event):
+            return
+        # depth=2 attributes the record to the caller of info()/debug()
+        if fields is None:
+            logger.opt(depth=2).log(level, message)
+        else:
+            # lazy=True defers fields() until loguru has passed the level check
+            logger.opt(lazy=True, depth=2).log(level, message, extra=fields)
+
+
+def configure_intake_logging(
+    sink: Any = sys.stderr, level: Optional[str] = None
+) -> None:
+    """
+    Replace loguru's default handler with a queued sink.
+
+    Records are handed to a background thread (``enqueue=True``) and written
+    there. Calling this again replaces the previously installed sink.
+    """
+    global _handler_id
+    if _handler_id is None:
+        try:
+            logger.remove(0)
+        except ValueError:
+            pass
+    else:
+        logger.remove(_handler_id)
+    _handler_id = logger.add(
+        sink,
+        level=level or config.INTAKE_LOG_LEVEL,
+        enqueue=config.INTAKE_LOG_ENQUEUE,
+        backtrace=False,
+        diagnose=False,
+    )
+
+
+async def flush_intake_logging() -> None:
+    """Wait for queued log records to be written (call on shutdown)."""
+    await logger.complete()
+
+
+# Shared logger for the intake webhooks, parser and Grow submission
+intake_log = IntakeLogger()
@@ -1,50 +1,14 @@
-import base64
-import json
+"""Compatibility names for the consolidated normalizer in ``field_normalizer``."""
 
+from functools import partial
 
-def try_base64_decode(value):
-    if not isinstance(value, str):
-        return value
-    try:
-        decoded = base64.b64decode(value, validate=True)
-        as_str = decoded.decode("utf-8")
-        if as_str.strip().startswith(("{", "[")):
-            return as_str
-        return value
-    except Exception:
-        return value
+from clio_manage.utils.field_normalizer import (
+    NormalizeStats,
+    normalize_encoded,
+    normalize_value as normalize_field,
+)
 
+__all__ = ["NormalizeStats", "normalize_field", "normalize_fields_recursive"]
 
-def try_json_parse(value):
-    if not isinstance(value, str):
-        return value
-    try:
-        return json.loads(value)
-    except Exception:
-        return value
-
-
-def normalize_field(value):
-    v = try_base64_decode(value)
-    v = try_json_parse(v)
-    # Try twice in case of double encoding
-    if isinstance(v, str):
-        v2 = try_base64_decode(v)
-        v2 = try_json_parse(v2)
-        if v2 != v:
-            return v2
-    return v
-
-
-def normalize_fields_recursive(data):
-    """
-    Recursively normalize all fields in a dict/list structure.
-    """
-    if isinstance(data, dict):
-        return {
-            k: normalize_fields_recursive(normalize_field(v)) for k, v in data.items()
-        }
-    elif isinstance(data, list):
-        return [normalize_fields_recursive(normalize_field(i)) for i in data]
-    else:
-        return normalize_field(data)
+# Also normalizes inside values that decode to dicts/lists
+normalize_fields_recursive = partial(normalize_encoded, walk_decoded=True)
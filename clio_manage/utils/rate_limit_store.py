@@ -0,0 +1,196 @@
+"""
+Shared request budgets for ``ClioRateLimiter``.
+
+A store keeps one token bucket per named budget: it holds up to ``burst``
+tokens, refills at ``rate`` tokens per second, and every request takes one.
+Unlike fixed windows, a bucket cannot let twice the quota through around a
+window boundary. The SQLite store keeps its buckets in a database file opened
+by every uvicorn and Celery worker on the host, so they all spend one budget
+and a restart does not refill it. The Redis store does the same across hosts.
+The memory store is per process.
+
+The memory store uses the monotonic clock. Shared stores need a clock every
+process agrees on, so they use wall time (Redis: the server's) and treat a
+clock step backwards as no elapsed time.
+"""
+
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+from clio_manage import config
+
+
+def _take(
+    tokens: float, elapsed: float, rate: float, burst: float
+) -> Tuple[float, float]:
+    """
+    Refill a bucket for ``elapsed`` seconds and take one token if there is one.
+
+    Returns:
+        Tuple of (tokens left, seconds to wait; 0.0 if a token was taken)
+    """
+    tokens = min(burst, tokens + max(0.0, elapsed) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+class RateLimitStore(ABC):
+    """Token buckets for named request budgets."""
+
+    # True if reserve() does I/O and should run off the event loop
+    blocking = False
+
+    @abstractmethod
+    def reserve(self, key: str, rate: float, burst: float) -> float:
+        """
+        Take one token from the ``key`` bucket if one is available.
+
+        Args:
+            key: Budget name
+            rate: Refill rate in tokens per second
+            burst: Bucket capacity; a new bucket starts full
+
+        Returns:
+            0.0 if a token was taken, otherwise seconds until one is available
+        """
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Per-process budget."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str, rate: float, burst: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens, wait = _take(tokens, now - updated, rate, burst)
+            self._buckets[key] = (tokens, now)
+            return wait
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """Budget shared by every process that opens the same database file."""
+
+    blocking = True
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+
+    def reserve(self, key: str, rate: float, burst: float) -> float:
+        db = self._connection()
+        # BEGIN IMMEDIATE takes the write lock up front, so the read and the
+        # update below are atomic across processes
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = db.execute(
+                "SELECT tokens, updated FROM clio_rate_buckets WHERE key = ?",
+                (key,),
+            ).fetchone()
+            tokens, updated = row if row is not None else (burst, now)
+            tokens, wait = _take(tokens, now - updated, rate, burst)
+            db.execute(
+                "INSERT OR REPLACE INTO clio_rate_buckets (key, tokens, updated)"
+                " VALUES (?, ?, ?)",
+                (key, tokens, now),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return wait
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread (reserve runs in the default executor)."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(
+                self.path, timeout=self.busy_timeout, isolation_level=None
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS clio_rate_buckets ("
+                " key TEXT PRIMARY KEY,"
+                " tokens REAL NOT NULL,"
+                " updated REAL NOT NULL)"
+            )
+            self._local.db = db
+        return db
+
+
+# Same arithmetic as _take, run atomically on the Redis server with its clock.
+# The wait is returned as a string: Lua numbers become integer replies.
+_REDIS_TAKE = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """Budget shared across hosts through Redis (needs the ``redis`` package)."""
+
+    blocking = True
+
+    def __init__(self, url: str, prefix: str = "clio_rate_limit"):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError(
+                "CLIO_RATE_LIMIT_STORE points at Redis but the redis package "
+                "is not installed (pip install redis)"
+            )
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.client.register_script(_REDIS_TAKE)
+
+    def reserve(self, key: str, rate: float, burst: float) -> float:
+        wait = self._take(keys=[f"{self.prefix}:{key}"], args=[rate, burst])
+        return float(wait)
+
+
+_stores: Dict[str, RateLimitStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_rate_limit_store(url: Optional[str] = None) -> RateLimitStore:
+    """Return the process-wide store for ``url`` (default: CLIO_RATE_LIMIT_STORE)."""
+    url = url or config.CLIO_RATE_LIMIT_STORE
+    with _stores_lock:
+        store = _stores.get(url)
+        if store is None:
+            store = _stores[url] = _create_store(url)
+        return store
+
+
+def _create_store(url: str) -> RateLimitStore:
+    if url == "memory":
+        return MemoryRateLimitStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteRateLimitStore(url[len("sqlite:///") :])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisRateLimitStore(url)
+    raise ValueError(f"Unsupported CLIO_RATE_LIMIT_STORE: {url}")
@@ -4,6 +4,7 @@ FastAPI proxy server for handling Clio lead submissions.
 Receives leads from web forms or Capture Now bot and forwards them to Clio Grow.
 """
 
+from contextlib import asynccontextmanager
 from typing import Any, Dict, Optional
 
 import uvicorn
@@ -11,21 +12,70 @@ import uvicorn
 # Import our enhanced functions
 from app.send_intake import (
     create_clio_lead,
-    create_clio_lead_from_any_payload,
     map_envelope_to_clio_lead,
-    process_envelope_payload,
     validate_envelope,
 )
 from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from loguru import logger
 from pydantic import BaseModel, ValidationError
 
+from clio_manage.routers.intake_admin import router as intake_admin_router
+from clio_manage.routers.intake_status import (
+    AcceptedResult,
+    accept_payload,
+    get_idempotency_key,
+    queue_lead,
+    router as intake_status_router,
+    should_queue,
+)
+from clio_manage.routers.metrics import (
+    router as metrics_router,
+    track_request_latency,
+)
+from clio_manage.services.circuit_breaker import CircuitOpenError
+from clio_manage.services.grow_submission import extract_lead_id, grow_engine
+from clio_manage.services.intake_queue import intake_queue
+from clio_manage.services.intake_writer import intake_writer
+from clio_manage.utils.auto_normalize import NormalizedJSONRoute
+from clio_manage.utils.intake_logging import (
+    configure_intake_logging,
+    flush_intake_logging,
+    intake_log,
+    request_size,
+)
+from clio_manage.utils.metrics import time_stage
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the intake queue workers; flush writes and close the Grow client."""
+    configure_intake_logging()
+    await intake_queue.start()
+    yield
+    await intake_queue.stop()
+    await intake_writer.stop()
+    await grow_engine.aclose()
+    await flush_intake_logging()
+
+
 app = FastAPI(
     title="Clio Lead Intake Proxy",
     description="Proxy server for handling web form and voice agent leads to Clio Grow",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Webhook bodies are parsed once per request
+app.router.route_class = NormalizedJSONRoute
+
+app.include_router(intake_status_router)
+app.include_router(intake_admin_router)
+app.include_router(metrics_router)
+app.middleware("http")(track_request_latency)
+
+ACCEPTED_RESPONSES = {202: {"model": AcceptedResult}}
+
 
 # Pydantic models for API documentation
 class DirectPayload(BaseModel):
@@ -56,16 +106,20 @@ class LeadResponse(BaseModel):
     data: Optional[Dict[str, Any]] = None
 
 
-@app.post("/webhook/web-form", response_model=LeadResponse)
-async def handle_web_form(payload: DirectPayload):
+@app.post(
+    "/webhook/web-form", response_model=LeadResponse, responses=ACCEPTED_RESPONSES
+)
+async def handle_web_form(payload: DirectPayload, request: Request):
     """
     Handle direct payloads from web forms.
     Expects the new Clio API format with inbox_lead structure.
     """
-    logger.info(
+    intake_log.info(
+        "webhook.web_form",
         "Received web form submission",
-        extra={
-            "has_inbox_lead": "inbox_lead" in payload.model_dump(),
+        lambda: {
+            "has_inbox_lead": payload.inbox_lead is not None,
+            "payload_size": request_size(request),
             "inbox_lead_keys": (
                 list(payload.inbox_lead.keys()) if payload.inbox_lead else []
             ),
@@ -75,19 +129,24 @@ async def handle_web_form(payload: DirectPayload):
     try:
         # Extract the inbox_lead data
         lead_data = payload.inbox_lead
-
-        # Use our unified function to process any payload format
-        response_data, status_code, saved_leads = create_clio_lead_from_any_payload(
-            {"inbox_lead": lead_data}
+        direct_payload = {
+            "inbox_lead": lead_data,
+            "inbox_lead_token": payload.inbox_lead_token or grow_engine.inbox_token,
+        }
+
+        idempotency_key = get_idempotency_key(request)
+        if should_queue(request):
+            return await accept_payload(direct_payload, idempotency_key)
+
+        # Submit through the shared async engine
+        response_data, status_code = await grow_engine.submit_any_payload(
+            direct_payload, idempotency_key=idempotency_key
         )
 
         if status_code == 201:
-            clio_id = (
-                response_data.get("id") if isinstance(response_data, dict) else None
-            )
             return LeadResponse(
                 status="success",
-                clio_lead_id=clio_id,
+                clio_lead_id=extract_lead_id(response_data),
                 message="Lead created successfully in Clio",
                 data=response_data,
             )
@@ -97,6 +156,9 @@ async def handle_web_form(payload: DirectPayload):
                 detail=f"Failed to create lead in Clio: {response_data}",
             )
 
+    except CircuitOpenError:
+        # Clio Grow went down mid-request; queue the lead instead of failing
+        return await accept_payload(direct_payload, idempotency_key)
     except Exception as e:
         logger.error(f"Web form processing failed: {str(e)}")
         raise HTTPException(
@@ -105,15 +167,18 @@ async def handle_web_form(payload: DirectPayload):
         )
 
 
-@app.post("/webhook/capture-now", response_model=LeadResponse)
-async def handle_capture_now(payload: EnvelopePayload):
+@app.post(
+    "/webhook/capture-now", response_model=LeadResponse, responses=ACCEPTED_RESPONSES
+)
+async def handle_capture_now(payload: EnvelopePayload, request: Request):
     """
     Handle envelope payloads from Capture Now voice agent.
     Expects envelope format with flat structure.
     """
-    logger.info(
+    intake_log.info(
+        "webhook.capture_now",
         "Received Capture Now agent submission",
-        extra={
+        lambda: {
             "contact_name": f"{payload.first_name or ''} {payload.last_name or ''}".strip(),
             "source": payload.source,
             "has_message": bool(payload.message),
@@ -124,18 +189,19 @@ async def handle_capture_now(payload: EnvelopePayload):
         # Convert Pydantic model to dict
         envelope_data = payload.model_dump(exclude_none=True)
 
-        # Use our envelope processing function
-        response_data, status_code = process_envelope_payload(envelope_data)
+        idempotency_key = get_idempotency_key(request)
+        if should_queue(request):
+            return await accept_payload(envelope_data, idempotency_key)
+
+        # Flat envelope fields are parsed as a mixed payload by the engine
+        response_data, status_code = await grow_engine.submit_any_payload(
+            envelope_data, idempotency_key=idempotency_key
+        )
 
         if status_code == 201:
-            clio_id = (
-                response_data.get("inbox_lead", {}).get("id")
-                if isinstance(response_data, dict)
-                else None
-            )
             return LeadResponse(
                 status="success",
-                clio_lead_id=clio_id,
+                clio_lead_id=extract_lead_id(response_data),
                 message="Voice agent lead created successfully in Clio",
                 data=response_data,
             )
@@ -145,6 +211,8 @@ async def handle_capture_now(payload: EnvelopePayload):
                 detail=f"Failed to create voice agent lead in Clio: {response_data}",
             )
 
+    except CircuitOpenError:
+        return await accept_payload(envelope_data, idempotency_key)
     except Exception as e:
         logger.error(f"Capture Now processing failed: {str(e)}")
         raise HTTPException(
@@ -153,27 +221,41 @@ async def handle_capture_now(payload: EnvelopePayload):
         )
 
 
-@app.post("/webhook/unified", response_model=LeadResponse)
+@app.post("/webhook/unified", response_model=LeadResponse, responses=ACCEPTED_RESPONSES)
 async def handle_unified(request: Request):
     """
     Unified endpoint that auto-detects payload format.
     Handles both web forms and voice agent submissions.
+    Send ``Prefer: respond-async`` (or ``?async=true``) to queue the payload
+    and get a 202 instead of waiting for Clio Grow. Payloads are also queued
+    while Clio Grow's circuit breaker is open.
     """
     try:
         # Get raw JSON payload
         payload = await request.json()
 
-        logger.info(
+        intake_log.info(
+            "webhook.unified",
             "Received unified submission",
-            extra={
+            lambda: {
                 "payload_keys": list(payload.keys()),
-                "payload_size": len(str(payload)),
+                "payload_size": request_size(request),
             },
         )
 
-        # Use our unified function that handles any format
-        response_data, status_code, saved_leads = create_clio_lead_from_any_payload(
-            payload
+        idempotency_key = get_idempotency_key(request)
+        if should_queue(request):
+            return await accept_payload(payload, idempotency_key)
+
+        # Use the async engine that handles any format. If the circuit opens
+        # partway through a multi-lead payload, only the leads it rejected
+        # are queued; the rest finish (and are recorded) first.
+        response_data, status_code = await grow_engine.submit_any_payload(
+            payload,
+            idempotency_key=idempotency_key,
+            on_circuit_open=lambda lead, index: queue_lead(
+                lead, idempotency_key, index
+            ),
         )
 
         # Handle different response types
@@ -190,12 +272,9 @@ async def handle_unified(request: Request):
             )
         elif status_code == 201:
             # Single lead processed successfully
-            clio_id = (
-                response_data.get("id") if isinstance(response_data, dict) else None
-            )
             return LeadResponse(
                 status="success",
-                clio_lead_id=clio_id,
+                clio_lead_id=extract_lead_id(response_data),
                 message="Lead created successfully in Clio",
                 data=response_data,
             )
@@ -205,6 +284,9 @@ async def handle_unified(request: Request):
                 detail=f"Failed to process lead: {response_data}",
             )
 
+    except CircuitOpenError:
+        # Only single-lead payloads get here; nothing was sent to Clio
+        return await accept_payload(payload, idempotency_key)
     except ValidationError as e:
         logger.error(f"Validation error: {str(e)}")
         raise HTTPException(
@@ -230,8 +312,11 @@ async def handle_legacy(envelope: Dict[str, Any]):
     )
 
     try:
-        # Use the main create_clio_lead function
-        response_data, status_code = create_clio_lead(envelope)
+        # create_clio_lead is synchronous; keep it off the event loop
+        with time_stage("legacy_submit"):
+            response_data, status_code = await run_in_threadpool(
+                create_clio_lead, envelope
+            )
 
         if status_code == 201:
             clio_id = (